@@ -5,7 +5,7 @@ High-level service that orchestrates vessel search operations using
 the ElasticsearchService tool.
 """
 
-from typing import List, Optional
+from typing import List
 from ..models.vessel import VesselData
 from ..tools.elasticsearch_client import elasticsearch_service
 
@@ -27,7 +27,8 @@ class VesselSearchService:
         self,
         min_distance_miles: float = 50.0,
         date: str = "2022-01-01",
-        max_vessels: int = 10
+        max_vessels: int = 10,
+        server_side_distance: bool = False
     ) -> List[VesselData]:
         """
         Find vessels that traveled long distances on a specific date.
@@ -36,6 +37,7 @@ class VesselSearchService:
             min_distance_miles: Minimum distance threshold
             date: Analysis date (YYYY-MM-DD format)
             max_vessels: Maximum number of vessels to return
+            server_side_distance: Let Elasticsearch compute and filter track distances
             
         Returns:
             List of VesselData objects sorted by distance traveled
@@ -46,7 +48,8 @@ class VesselSearchService:
             # Use the elasticsearch service to find vessels
             vessels = self.elasticsearch.search_vessels_by_distance(
                 min_distance_miles=min_distance_miles,
-                date=date
+                date=date,
+                server_side_distance=server_side_distance
             )
             
             # Limit results to max_vessels
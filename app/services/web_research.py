@@ -5,7 +5,8 @@ High-level service that orchestrates web research workflows using
 the ChromeMCPClient tool.
 """
 
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any
 from ..models.vessel import VesselData
 from ..models.research import WebSearchResult
 from ..tools.chrome_mcp_client import chrome_mcp_client
@@ -48,13 +49,20 @@ class WebResearchService:
         Returns:
             List of WebSearchResult objects
         """
+        # Configure client for this research
+        original_num_links = self.chrome_client.num_links
+        self.chrome_client.num_links = num_sources
+        try:
+            return self._search_vessel(vessel, research_focus)
+        finally:
+            # Restore original configuration
+            self.chrome_client.num_links = original_num_links
+    
+    def _search_vessel(self, vessel: VesselData, research_focus: str) -> List[WebSearchResult]:
+        """Run the web search for one vessel with the client's current link count"""
         print(f"🔍 Researching vessel: {vessel.vessel_name} ({vessel.mmsi})")
         
         try:
-            # Configure client for this research
-            original_num_links = self.chrome_client.num_links
-            self.chrome_client.num_links = num_sources
-            
             # Build search query
             search_terms = [vessel.vessel_name]
             if vessel.mmsi:
@@ -76,9 +84,6 @@ class WebResearchService:
                 if not result.mmsi:
                     result.mmsi = vessel.mmsi
             
-            # Restore original configuration
-            self.chrome_client.num_links = original_num_links
-            
             print(f"✅ Research complete: {len(results)} sources found")
             return results
             
@@ -90,15 +95,21 @@ class WebResearchService:
         self,
         vessels: List[VesselData],
         research_focus: str = "specifications",
-        num_sources: int = 3
+        num_sources: int = 3,
+        max_parallel_vessels: int = 2
     ) -> Dict[str, List[WebSearchResult]]:
         """
         Research multiple vessels and organize results by MMSI.
         
+        Vessels are researched concurrently. The client lets one search drive
+        the browser at a time, so the gain comes from browsing the next vessel
+        while the previous one's pages are still being extracted by the LLM.
+        
         Args:
             vessels: List of VesselData objects to research
             research_focus: Research focus area
             num_sources: Number of web sources per vessel
+            max_parallel_vessels: Vessels researched at the same time
             
         Returns:
             Dictionary mapping MMSI to list of WebSearchResult objects
@@ -107,27 +118,36 @@ class WebResearchService:
         
         vessel_research_results = {}
         successful_research = 0
+        if not vessels:
+            return vessel_research_results
         
-        for i, vessel in enumerate(vessels, 1):
-            print(f"🚢 Processing vessel {i}/{len(vessels)}: {vessel.vessel_name}")
-            
-            try:
-                results = self.research_vessel(
-                    vessel=vessel,
-                    research_focus=research_focus,
-                    num_sources=num_sources
-                )
+        # Link count is set once for the batch, not per vessel, since searches overlap
+        original_num_links = self.chrome_client.num_links
+        self.chrome_client.num_links = num_sources
+        try:
+            max_workers = max(1, min(len(vessels), max_parallel_vessels))
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vessel-research") as executor:
+                futures = [executor.submit(self._search_vessel, vessel, research_focus) for vessel in vessels]
                 
-                if results and not all(r.url == "error" for r in results):
-                    vessel_research_results[vessel.mmsi] = results
-                    successful_research += 1
-                    print(f"✅ Research successful for {vessel.vessel_name}")
-                else:
-                    print(f"⚠️ No quality results found for {vessel.vessel_name}")
+                # Collected in input order so results keep the vessel ranking
+                for i, (vessel, future) in enumerate(zip(vessels, futures), 1):
+                    print(f"🚢 Processing vessel {i}/{len(vessels)}: {vessel.vessel_name}")
                     
-            except Exception as e:
-                print(f"❌ Research error for {vessel.vessel_name}: {e}")
-                continue
+                    try:
+                        results = future.result()
+                        
+                        if results and not all(r.url == "error" for r in results):
+                            vessel_research_results[vessel.mmsi] = results
+                            successful_research += 1
+                            print(f"✅ Research successful for {vessel.vessel_name}")
+                        else:
+                            print(f"⚠️ No quality results found for {vessel.vessel_name}")
+                            
+                    except Exception as e:
+                        print(f"❌ Research error for {vessel.vessel_name}: {e}")
+                        continue
+        finally:
+            self.chrome_client.num_links = original_num_links
         
         print(f"🎯 Multi-vessel research complete: {successful_research}/{len(vessels)} vessels")
         return vessel_research_results
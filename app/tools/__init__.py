@@ -5,14 +5,28 @@ MCP-ready tool classes:
 - elasticsearch_client: Vessel search and data retrieval (future MCP server)
 - chrome_mcp_client: Web research via MCP Chrome bridge  
 - report_writer: Report generation (future MCP server)
+
+Each tool module pulls in a heavy client library (elasticsearch, mcp, folium),
+so the classes are imported on first attribute access rather than eagerly;
+importing one tool module no longer loads the other two.
 """
 
-from .elasticsearch_client import ElasticsearchService
-from .chrome_mcp_client import ChromeMCPClient  
-from .report_writer import ReportWriter
+from importlib import import_module
+
+_LAZY_EXPORTS = {
+    'ElasticsearchService': '.elasticsearch_client',
+    'ChromeMCPClient': '.chrome_mcp_client',
+    'ReportWriter': '.report_writer'
+}
 
 __all__ = [
     'ElasticsearchService',
     'ChromeMCPClient', 
     'ReportWriter'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,18 +7,209 @@ and provides LLM-guided web research capabilities.
 
 import json
 import asyncio
-import shutil
+import atexit
+import functools
+import threading
 import time
 import re
-import urllib.parse
 import os
-from typing import List, Dict, Any, Optional
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable, Tuple
 
 from mcp import ClientSession, StdioServerParameters
+from pydantic import BaseModel, Field
 from mcp.client.stdio import stdio_client
 
 from ..models.research import WebSearchResult
 from ..utils.file_ops import sanitize_url_for_filename, ensure_directory, safe_move_file
+from ..utils.cache import LRUCache, content_digest
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps_pretty(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+except ImportError:  # orjson is pinned in requirements.txt; stdlib fallback for bare installs
+    _json_loads = json.loads
+
+    def _json_dumps_pretty(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
+
+
+def _is_json_object_text(text: Any) -> bool:
+    """Cheap check that text could be a JSON object, before paying for a parse attempt"""
+    return isinstance(text, str) and text.lstrip()[:1] == "{"
+
+
+# Bridge tools after which the active page may differ, invalidating cached elements
+_PAGE_CHANGING_METHODS = frozenset(("chrome_navigate", "chrome_click_element"))
+
+# Seconds a single MCP tool call may take before it is abandoned
+_MCP_CALL_TIMEOUT = 60.0
+
+# Page text budget of the metadata extraction prompt, and the rough
+# characters-per-token ratio of English web text used without tiktoken
+_METADATA_PROMPT_TOKENS = 2000
+_CHARS_PER_TOKEN = 4
+
+# Upper bound on page text kept per link; the LLM only reads a prefix of
+# _METADATA_PROMPT_TOKENS and the saved copy is a debugging aid, not an archive
+_MAX_PAGE_CONTENT_CHARS = 50_000
+
+# Search results offered to the LLM for link selection
+_MAX_LINK_CANDIDATES = 10
+
+# Google navigation/chrome labels that are never organic search results. Checked
+# as plain substrings of the lowercased text: CPython's re has no DFA, and an
+# IGNORECASE alternation of these terms measured ~10x slower than this scan
+_SKIP_TERMS = ("sign in", "images", "videos", "news", "shopping", "more", "tools", "settings")
+
+# Search result links show their target URL in the element text
+_URL_RE = re.compile(r"https?://|www\.", re.IGNORECASE)
+
+# Free-text LLM responses: the JSON index array of a link selection, and the
+# markup (e.g. <think> tags) some local models wrap around their JSON
+_INDICES_RE = re.compile(r"\[[\d,\s]+\]")
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+
+# Fallback detail extraction: only the top of the page is scanned, one line
+# at a time, against these label patterns
+_DETAIL_SCAN_LINES = 100
+_DETAIL_PATTERNS = [
+    (re.compile(r'(?i).*vessel\s+name[:\s]+(.*)'), 'Vessel: {}'),
+    (re.compile(r'(?i).*imo[:\s]+(\d+)'), 'IMO: {}'),
+    (re.compile(r'(?i).*mmsi[:\s]+(\d+)'), 'MMSI: {}'),
+    (re.compile(r'(?i).*length[:\s]+(\d+\.?\d*\s*m)'), 'Length: {}'),
+    (re.compile(r'(?i).*flag[:\s]+([^\n\r]{1,30})'), 'Flag: {}'),
+    (re.compile(r'(?i).*type[:\s]+([^\n\r]{1,40})'), 'Type: {}')
+]
+
+
+def _make_response_extractor(*keys: str) -> Callable[[Any], Any]:
+    """
+    Build an accessor that unwraps a decoded MCP payload.
+    
+    The first key present wins: "data" is returned as-is, any other key is
+    returned wrapped as {key: value} so callers keep their existing shape.
+    """
+    def extract(payload: Any) -> Any:
+        if not isinstance(payload, dict):
+            return payload
+        for key in keys:
+            if key in payload:
+                return payload[key] if key == "data" else {key: payload[key]}
+        return payload
+    
+    return extract
+
+
+# Known response shapes of the Chrome MCP bridge tools, resolved once at import
+_default_response_extractor = _make_response_extractor("data", "elements", "content")
+_RESPONSE_EXTRACTORS: Dict[str, Callable[[Any], Any]] = {
+    "chrome_get_interactive_elements": _default_response_extractor,
+    "chrome_get_web_content": _make_response_extractor("data", "content"),
+    "chrome_screenshot": _make_response_extractor("data", "content"),
+    "get_windows_and_tabs": _make_response_extractor("data"),
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_token_encoding() -> Optional[Any]:
+    """
+    Load the tiktoken encoding on first use, or None if it is unavailable.
+    
+    tiktoken is optional, and loading an encoding that isn't cached yet
+    downloads it, which fails offline. Either way prompt budgets fall back
+    to a characters-per-token estimate instead of breaking the import.
+    """
+    try:
+        import tiktoken
+        
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"⚠️ tiktoken unavailable, estimating prompt tokens from characters: {e}")
+        return None
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cut text to roughly max_tokens prompt tokens, ending on a word boundary.
+    
+    Only a prefix a little longer than the budget is tokenized, so the cost
+    does not grow with the page size.
+    
+    Args:
+        text: Text to truncate
+        max_tokens: Token budget
+        
+    Returns:
+        Prefix of text within the budget
+    """
+    char_budget = max_tokens * _CHARS_PER_TOKEN
+    encoding = _get_token_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text[:char_budget * 2], disallowed_special=())
+        if len(tokens) <= max_tokens and len(text) <= char_budget * 2:
+            return text
+        text = encoding.decode(tokens[:max_tokens])
+    elif len(text) <= char_budget:
+        return text
+    else:
+        text = text[:char_budget]
+    
+    # Drop the partial trailing word so the model never sees a cut-off token
+    cut = text.rfind(" ", len(text) - 64)
+    return text[:cut] if cut > 0 else text
+
+
+class _LinkSelection(BaseModel):
+    """Structured LLM answer for search result link selection"""
+    indices: List[int] = Field(..., description="Indices of the selected search results, best first")
+
+
+class _AsyncLoopThread:
+    """
+    Event loop running forever on a daemon thread.
+    
+    Synchronous callers submit coroutines from any thread and block on the
+    result, while the loop keeps servicing the MCP session between calls.
+    """
+    
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="mcp-event-loop", daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+    
+    def run(self, coro, timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the loop and wait for its result.
+        
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait before cancelling it, or None to wait forever
+            
+        Returns:
+            The coroutine's result
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+    
+    def stop(self):
+        """Stop the loop, wait for its thread and close it"""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
 
 
 class ChromeMCPClient:
@@ -49,6 +240,30 @@ class ChromeMCPClient:
         self.server_params = self._load_mcp_configuration()
         self._tools_listed = False
         
+        # Memoized LLM decisions; repeated queries skip the LLM round-trip
+        self._link_selection_cache = LRUCache(maxsize=256)
+        self._metadata_cache = LRUCache(maxsize=256)
+        
+        # LLM bound to the _LinkSelection schema; None until first use, False if unsupported
+        self._link_selector = None
+        
+        # Parsed interactive elements of the active page, valid while the page version holds
+        self._page_version = 0
+        self._elements_cache: Optional[Tuple[int, List[Dict]]] = None
+        
+        # Search result directories already created, by vessel MMSI
+        self._search_dirs: Dict[str, str] = {}
+        
+        # Serializes searches that drive the shared browser tab
+        self._browser_lock = threading.Lock()
+        
+        # Persistent MCP session state, created lazily on the first call
+        self._loop_thread: Optional[_AsyncLoopThread] = None
+        self._session_lock = threading.Lock()
+        self._session: Optional[ClientSession] = None
+        self._session_task: Optional[asyncio.Task] = None
+        self._session_closing: Optional[asyncio.Event] = None
+        
         print(f"🌐 ChromeMCPClient initialized with {num_links} links from {config_path}")
     
     def _load_mcp_configuration(self) -> StdioServerParameters:
@@ -81,75 +296,160 @@ class ChromeMCPClient:
                 env={}
             )
     
-    async def _call_mcp_async(self, method: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _ensure_session(self) -> ClientSession:
         """
-        Make asynchronous call to MCP Chrome bridge.
+        Return the long-lived MCP session, starting it on first use.
+        
+        The stdio subprocess and MCP handshake happen once per client instead
+        of once per tool call; every later call reuses the open session. The
+        session lives on a background event loop, so callers on any thread
+        share it.
         
-        Args:
-            method: MCP method name
-            params: Method parameters
-            
         Returns:
-            Parsed MCP response
+            Initialized MCP client session
         """
-        if params is None:
-            params = {}
+        with self._session_lock:
+            if self._session is not None and self._session_task.done():
+                # The owner task exits when the bridge process or its pipes go away
+                print("🔄 MCP session closed by the bridge, reconnecting")
+                self._session = None
+                self._session_task = None
+            if self._session is None:
+                if self._loop_thread is None:
+                    self._loop_thread = _AsyncLoopThread()
+                    atexit.register(self.close)
+                self._session = self._loop_thread.run(self._open_session())
+            return self._session
+    
+    async def _open_session(self) -> ClientSession:
+        """Start the session-owner task and wait until its session is ready"""
+        ready = asyncio.get_running_loop().create_future()
+        self._session_closing = asyncio.Event()
+        self._session_task = asyncio.create_task(self._own_session(ready))
+        return await ready
+    
+    async def _own_session(self, ready: asyncio.Future):
+        """
+        Hold the stdio transport and MCP session open until close() is called.
+        
+        The stdio client's cancel scopes must be entered and exited by the same
+        task, so a dedicated task owns both contexts for the session lifetime.
         
+        Args:
+            ready: Future resolved with the session once it is initialized
+        """
         try:
             async with stdio_client(self.server_params) as (read, write):
                 async with ClientSession(read, write) as session:
                     await session.initialize()
                     
-                    # List available tools on first call
+                    # List available tools once per session
                     if not self._tools_listed:
                         tools = await session.list_tools()
                         print(f"🔧 Available MCP tools: {[tool.name for tool in tools.tools]}")
                         self._tools_listed = True
                     
-                    # Call the tool
-                    result = await session.call_tool(method, params)
-                    
-                    # Parse TextContent response
-                    parsed_result = self._parse_mcp_response(result)
-                    return {"result": parsed_result}
-                    
+                    ready.set_result(session)
+                    await self._session_closing.wait()
         except Exception as e:
-            return {"error": f"MCP call failed: {str(e)}"}
+            if not ready.done():
+                ready.set_exception(e)
+    
+    async def _close_session(self):
+        """Signal the session-owner task to exit and wait for it"""
+        self._session_closing.set()
+        await self._session_task
+    
+    def _reset_session(self):
+        """Tear down a broken session so the next call starts a fresh one"""
+        with self._session_lock:
+            try:
+                if self._session_task is not None and not self._session_task.done():
+                    self._loop_thread.run(self._close_session(), timeout=_MCP_CALL_TIMEOUT)
+            except Exception as e:
+                print(f"⚠️ Error closing broken MCP session: {e}")
+            finally:
+                self._session = None
+                self._session_task = None
+    
+    def close(self):
+        """Shut down the MCP session, its subprocess and the event loop thread"""
+        with self._session_lock:
+            if self._loop_thread is None:
+                return
+            try:
+                if self._session_task is not None and not self._session_task.done():
+                    self._loop_thread.run(self._close_session(), timeout=_MCP_CALL_TIMEOUT)
+            except Exception as e:
+                print(f"⚠️ Error closing MCP session: {e}")
+            finally:
+                self._loop_thread.stop()
+                self._loop_thread = None
+                self._session = None
+                self._session_task = None
     
-    def _parse_mcp_response(self, result) -> Any:
-        """Parse MCP response from TextContent objects"""
+    def __enter__(self) -> 'ChromeMCPClient':
+        """Scope the persistent MCP session to a with block"""
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _parse_mcp_response(self, result, method: str = "") -> Any:
+        """Parse MCP response from TextContent objects using the per-tool extractor"""
+        extract = _RESPONSE_EXTRACTORS.get(method, _default_response_extractor)
         parsed_result = None
         
         if hasattr(result, 'content') and isinstance(result.content, list):
             for content_item in result.content:
                 if hasattr(content_item, 'text'):
                     try:
-                        text_content = content_item.text
-                        parsed_data = json.loads(text_content)
-                        
-                        # Extract data from nested response structure
-                        if isinstance(parsed_data, dict):
-                            if "data" in parsed_data:
-                                parsed_result = parsed_data["data"]
-                            elif "elements" in parsed_data:
-                                parsed_result = {"elements": parsed_data["elements"]}
-                            elif "content" in parsed_data:
-                                parsed_result = {"content": parsed_data["content"]}
-                            else:
-                                parsed_result = parsed_data
-                        else:
-                            parsed_result = parsed_data
-                        break
-                        
+                        parsed_result = extract(_json_loads(content_item.text))
                     except json.JSONDecodeError:
                         parsed_result = content_item.text
-                        break
+                    break
         
         return parsed_result or result.content
     
     def _call_mcp(self, method: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Synchronous wrapper for async MCP calls"""
-        return asyncio.run(self._call_mcp_async(method, params))
+        """
+        Call an MCP Chrome bridge tool over the persistent session.
+        
+        Args:
+            method: MCP method name
+            params: Method parameters
+            
+        Returns:
+            Parsed MCP response
+        """
+        if params is None:
+            params = {}
+        if method in _PAGE_CHANGING_METHODS:
+            self._page_version += 1
+        
+        try:
+            session = self._ensure_session()
+        except Exception as e:
+            return {"error": f"MCP call failed: {str(e)}"}
+        
+        try:
+            result = self._loop_thread.run(session.call_tool(method, params), timeout=_MCP_CALL_TIMEOUT)
+        except TimeoutError:
+            return {"error": f"MCP call failed: {method} timed out after {_MCP_CALL_TIMEOUT:.0f}s"}
+        except Exception as e:
+            # Tool failures come back as results; an exception means the transport
+            # broke (e.g. the bridge process exited), so reconnect once and retry
+            print(f"🔄 MCP session lost ({str(e) or type(e).__name__}), reconnecting")
+            self._reset_session()
+            try:
+                session = self._ensure_session()
+                result = self._loop_thread.run(session.call_tool(method, params), timeout=_MCP_CALL_TIMEOUT)
+            except Exception as retry_error:
+                return {"error": f"MCP call failed: {str(retry_error) or type(retry_error).__name__}"}
+        
+        # Parse TextContent response
+        parsed_result = self._parse_mcp_response(result, method)
+        return {"result": parsed_result}
     
     def intelligent_search_and_navigate(
         self, 
@@ -173,38 +473,49 @@ class ChromeMCPClient:
         try:
             print(f"🔍 Multi-step LLM research for: {query}")
             
-            # Step 1: Navigate to Google search
-            search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
-            search_result = self._call_mcp("chrome_navigate", {"url": search_url})
-            
-            if "error" in search_result:
-                print(f"❌ Search navigation failed: {search_result['error']}")
-                return [WebSearchResult(url="error", content_snippet=search_result["error"])]
-            
-            print("✅ Navigated to Google search")
-            
-            # Step 2: Extract search result elements
-            search_elements = self._extract_search_results()
-            
-            if not search_elements:
-                print("❌ No relevant search results found")
-                return [WebSearchResult(url="error", content_snippet="No relevant search results")]
-            
-            # Step 3: LLM-guided link selection
-            selected_links = self._llm_select_top_links(search_elements, query, research_focus)
-            
-            if not selected_links:
-                print("❌ LLM failed to select links")
-                return [WebSearchResult(url="error", content_snippet="Failed to select relevant links")]
-            
-            # Step 4: Process each selected link
-            for i, link_info in enumerate(selected_links[:self.num_links]):
-                print(f"🌐 Processing link {i+1}/{min(len(selected_links), self.num_links)}: {link_info.get('text', '')[:50]}...")
+            # The browser is one shared tab, held only while this search drives it: pages
+            # are visited in turn and each page's LLM extraction runs in the background,
+            # so another search can take the tab while this one's last pages are extracted
+            with ThreadPoolExecutor(max_workers=max(1, self.num_links), thread_name_prefix="link-llm") as llm_executor:
+                pending = []
+                with self._browser_lock:
+                    # Step 1: Navigate to Google search
+                    search_url = f"https://www.google.com/search?q={urllib.parse.quote_plus(query)}"
+                    search_result = self._call_mcp("chrome_navigate", {"url": search_url})
+                    
+                    if "error" in search_result:
+                        print(f"❌ Search navigation failed: {search_result['error']}")
+                        return [WebSearchResult(url="error", content_snippet=search_result["error"])]
+                    
+                    print("✅ Navigated to Google search")
+                    
+                    # Step 2: Extract search result elements
+                    search_elements = self._extract_search_results()
+                    
+                    if not search_elements:
+                        print("❌ No relevant search results found")
+                        return [WebSearchResult(url="error", content_snippet="No relevant search results")]
+                    
+                    # Step 3: LLM-guided link selection
+                    selected_links = self._llm_select_top_links(search_elements, query, research_focus)
+                    
+                    if not selected_links:
+                        print("❌ LLM failed to select links")
+                        return [WebSearchResult(url="error", content_snippet="Failed to select relevant links")]
+                    
+                    # Step 4: Visit each selected link
+                    links = selected_links[:self.num_links]
+                    for i, link_info in enumerate(links):
+                        print(f"🌐 Processing link {i+1}/{len(links)}: {link_info.get('text', '')[:50]}...")
+                        
+                        page = self._visit_link(link_info, i+1, vessel_mmsi)
+                        pending.append(llm_executor.submit(self._extract_link_result, page, link_info, i+1, query))
                 
-                result = self._process_single_link(link_info, i+1, query, vessel_mmsi)
-                if vessel_mmsi:
-                    result.mmsi = vessel_mmsi
-                results.append(result)
+                for future in pending:
+                    result = future.result()
+                    if vessel_mmsi:
+                        result.mmsi = vessel_mmsi
+                    results.append(result)
             
             print(f"✅ Completed processing {len(results)} links")
             return results
@@ -218,31 +529,58 @@ class ChromeMCPClient:
     
     def _extract_search_results(self) -> List[Dict]:
         """Extract clickable search result elements from Google search page"""
-        links_result = self._call_mcp("chrome_get_interactive_elements")
+        elements = self._get_elements()
         
-        if "error" in links_result or "result" not in links_result or not links_result["result"]:
+        if not elements:
             print("❌ Failed to get elements")
             return []
         
-        # Parse elements with nested JSON handling
-        elements_data = links_result["result"]
-        elements = self._parse_elements_data(elements_data)
-        
-        # Filter for search result links
+        # Filter for search result links, stopping once there are as many as
+        # link selection can use (ads and footer links come later on the page)
+        max_results = max(_MAX_LINK_CANDIDATES, self.num_links)
         search_result_elements = []
-        skip_terms = ["sign in", "images", "videos", "news", "shopping", "more", "tools", "settings"]
         
         for element in elements:
-            if self._is_search_result_link(element, skip_terms):
+            if self._is_search_result_link(element):
                 search_result_elements.append({
                     "selector": element.get("selector", ""),
                     "text": element.get("text", "")[:300],
                     "type": element.get("type", "")
                 })
+                if len(search_result_elements) >= max_results:
+                    break
         
         print(f"🔍 Found {len(search_result_elements)} clickable search results")
         return search_result_elements
     
+    def _get_elements(self, refresh: bool = False) -> List[Dict]:
+        """
+        Return the parsed interactive elements of the active page.
+        
+        The fetched and parsed list is reused until a navigation or click
+        changes the page version, so callers inspecting the same page share
+        one MCP round-trip and one parse.
+        
+        Args:
+            refresh: Fetch again even if the page version is unchanged, for
+                callers polling a page that is still changing on its own
+            
+        Returns:
+            List of element dicts (empty if the fetch failed)
+        """
+        page_version = self._page_version
+        if not refresh and self._elements_cache is not None and self._elements_cache[0] == page_version:
+            return self._elements_cache[1]
+        
+        elements_result = self._call_mcp("chrome_get_interactive_elements")
+        if "error" in elements_result or not elements_result.get("result"):
+            return []
+        
+        # Parse elements with nested JSON handling
+        elements = self._parse_elements_data(elements_result["result"])
+        self._elements_cache = (page_version, elements)
+        return elements
+    
     def _parse_elements_data(self, elements_data) -> List[Dict]:
         """Parse elements data handling various nested structures"""
         elements = []
@@ -254,9 +592,9 @@ class ChromeMCPClient:
                 content = elements_data["content"]
                 if isinstance(content, list) and len(content) > 0:
                     first_item = content[0]
-                    if isinstance(first_item, dict) and "text" in first_item:
+                    if isinstance(first_item, dict) and _is_json_object_text(first_item.get("text")):
                         try:
-                            nested_json = json.loads(first_item["text"])
+                            nested_json = _json_loads(first_item["text"])
                             elements = nested_json.get("elements", [])
                         except json.JSONDecodeError:
                             elements = content
@@ -264,33 +602,37 @@ class ChromeMCPClient:
                         elements = content
         elif isinstance(elements_data, list):
             elements = elements_data
-            # Check for nested JSON in first element
-            if len(elements) > 0 and isinstance(elements[0], dict) and "text" in elements[0]:
+            # Check for nested JSON in first element; plain element text is skipped unparsed
+            if len(elements) > 0 and isinstance(elements[0], dict) and _is_json_object_text(elements[0].get("text")):
                 try:
-                    nested_json = json.loads(elements[0]["text"])
+                    nested_json = _json_loads(elements[0]["text"])
                     elements = nested_json.get("elements", elements)
                 except json.JSONDecodeError:
                     pass
         
         return elements
     
-    def _is_search_result_link(self, element: Dict, skip_terms: List[str]) -> bool:
+    def _is_search_result_link(self, element: Dict) -> bool:
         """Check if element is a valid search result link"""
         if not isinstance(element, dict):
             return False
             
         text = element.get("text", "")
-        elem_type = element.get("type", "")
         
-        return (
-            elem_type == "link" and
+        if not (
+            element.get("type", "") == "link" and
             element.get("isInteractive", False) and
             not element.get("disabled", True) and
             text and
-            len(text) > 20 and
-            ("http" in text.lower() or "www." in text.lower()) and
-            not any(skip in text.lower() for skip in skip_terms)
-        )
+            len(text) > 20
+        ):
+            return False
+        
+        if not _URL_RE.search(text):
+            return False
+        
+        text_lower = text.lower()
+        return not any(skip in text_lower for skip in _SKIP_TERMS)
     
     def _llm_select_top_links(self, search_results: List[Dict], query: str, research_focus: str) -> List[Dict]:
         """Use LLM to analyze and select the best search result links"""
@@ -298,8 +640,20 @@ class ChromeMCPClient:
             print("⚠️ No LLM available, selecting first results")
             return search_results[:self.num_links]
         
+        candidates = search_results[:_MAX_LINK_CANDIDATES]
+        cache_key = (
+            " ".join(query.lower().split()),
+            research_focus,
+            self.num_links,
+            tuple(result["text"] for result in candidates)
+        )
+        cached_indices = self._link_selection_cache.get(cache_key)
+        if cached_indices is not None:
+            print(f"🎯 Reusing cached LLM link selection: {cached_indices}")
+            return [search_results[idx] for idx in cached_indices]
+        
         results_text = ""
-        for i, result in enumerate(search_results[:10]):
+        for i, result in enumerate(candidates):
             results_text += f"{i}: {result['text']}\n\n"
         
         selection_prompt = f"""
@@ -326,19 +680,14 @@ class ChromeMCPClient:
         """
         
         try:
-            response = self.llm.invoke([
+            indices = self._invoke_link_selection([
                 ("system", "You are a maritime research expert. Select the most authoritative vessel information sources."),
                 ("user", selection_prompt)
             ])
-            
-            content = response.content.strip()
-            json_match = re.search(r'\[[\d,\s]+\]', content)
-            if json_match:
-                indices = json.loads(json_match.group())
-                selected_links = []
-                for idx in indices:
-                    if 0 <= idx < len(search_results):
-                        selected_links.append(search_results[idx])
+            if indices:
+                valid_indices = [idx for idx in indices if 0 <= idx < len(search_results)]
+                selected_links = [search_results[idx] for idx in valid_indices]
+                self._link_selection_cache.set(cache_key, valid_indices)
                 
                 print(f"🎯 LLM selected {len(selected_links)} links: {indices}")
                 return selected_links
@@ -349,6 +698,40 @@ class ChromeMCPClient:
         print(f"⚠️ Using fallback selection of first {self.num_links} results")
         return search_results[:self.num_links]
     
+    def _invoke_link_selection(self, messages: List[tuple]) -> Optional[List[int]]:
+        """
+        Ask the LLM for selected link indices.
+        
+        Uses structured output when the LLM supports it, so no text parsing is
+        needed; otherwise, or if the structured call fails, the JSON array is
+        parsed out of a free-text response.
+        
+        Args:
+            messages: Chat messages for the selection prompt
+            
+        Returns:
+            Selected indices, or None if the response held none
+        """
+        if self._link_selector is None:
+            try:
+                self._link_selector = self.llm.with_structured_output(_LinkSelection)
+            except (AttributeError, NotImplementedError):
+                self._link_selector = False
+        
+        if self._link_selector:
+            try:
+                selection = self._link_selector.invoke(messages)
+                if selection is not None:
+                    return list(selection.indices)
+            except Exception as e:
+                # Stop trying structured output with this LLM; every failure costs a round-trip
+                print(f"⚠️ Structured link selection failed, parsing text instead: {e}")
+                self._link_selector = False
+        
+        response = self.llm.invoke(messages)
+        json_match = _INDICES_RE.search(response.content.strip())
+        return _json_loads(json_match.group()) if json_match else None
+    
     def _process_single_link(
         self, 
         link_info: Dict, 
@@ -357,7 +740,26 @@ class ChromeMCPClient:
         vessel_mmsi: str = ""
     ) -> WebSearchResult:
         """Process a single link: navigate, extract content, save files, and use LLM for metadata extraction"""
+        page = self._visit_link(link_info, link_number, vessel_mmsi)
+        return self._extract_link_result(page, link_info, link_number, query)
+    
+    def _visit_link(self, link_info: Dict, link_number: int, vessel_mmsi: str = "") -> Dict[str, Any]:
+        """
+        Browser half of processing a link: click, wait, screenshot, extract and save content.
+        
+        Args:
+            link_info: Selected search result (selector and text)
+            link_number: 1-based position of the link, for messages and file names
+            vessel_mmsi: MMSI of vessel for file organization
+            
+        Returns:
+            Page dict with url, raw_content, content_file and screenshot_path, or
+            with a final "result" when the link could not be processed
+        """
         try:
+            # The results page stays up until the click's navigation commits
+            previous_url = self._get_current_url()
+            
             # Click on the link
             click_result = self._call_mcp("chrome_click_element", {
                 "selector": link_info["selector"]
@@ -365,15 +767,14 @@ class ChromeMCPClient:
             
             if "error" in click_result:
                 print(f"❌ Failed to click link {link_number}: {click_result['error']}")
-                return WebSearchResult(
+                return {"result": WebSearchResult(
                     url="error",
                     content_snippet=f"Link {link_number}: Click failed - {click_result['error']}"
-                )
+                )}
             
-            time.sleep(3)  # Wait for page load
-            
-            # Handle cookie dialogs
-            self._handle_cookie_dialogs()
+            # Wait for the new page to load, then handle cookie dialogs on it
+            elements = self._await_ready(previous_url=None if previous_url == "unknown" else previous_url)
+            self._handle_cookie_dialogs(elements)
             
             # Get current URL
             current_url = self._get_current_url()
@@ -386,15 +787,52 @@ class ChromeMCPClient:
             
             if not raw_content or len(raw_content) < 100:
                 print(f"⚠️ Insufficient content from link {link_number}")
-                return WebSearchResult(
+                return {"result": WebSearchResult(
                     url=current_url,
                     content_snippet=f"Link {link_number}: Insufficient content",
                     metadata_extracted={"screenshot_path": screenshot_path}
-                )
+                )}
             
             # Save content to file
             content_file = self._save_content_to_file(raw_content, current_url, vessel_mmsi)
             
+            return {
+                "url": current_url,
+                "raw_content": raw_content,
+                "content_file": content_file,
+                "screenshot_path": screenshot_path
+            }
+            
+        except Exception as e:
+            print(f"❌ Error processing link {link_number}: {str(e)}")
+            return {"result": WebSearchResult(
+                url="error",
+                content_snippet=f"Link {link_number}: Processing failed - {str(e)}"
+            )}
+    
+    def _extract_link_result(
+        self, page: Dict[str, Any], link_info: Dict, link_number: int, query: str
+    ) -> WebSearchResult:
+        """
+        LLM half of processing a link: extract vessel metadata from a visited page.
+        
+        Needs no browser access, so it can run while the next link is visited.
+        
+        Args:
+            page: Page dict returned by _visit_link
+            link_info: Selected search result (selector and text)
+            link_number: 1-based position of the link, for messages
+            query: Search query the link was selected for
+            
+        Returns:
+            WebSearchResult for the link
+        """
+        if "result" in page:
+            return page["result"]
+        
+        current_url = page["url"]
+        raw_content = page["raw_content"]
+        try:
             # LLM metadata extraction
             extraction_result = self._extract_vessel_metadata_with_llm(raw_content, query, current_url)
             
@@ -404,7 +842,7 @@ class ChromeMCPClient:
                 vessel_details = extraction_result.get("details", [])
                 
                 if isinstance(vessel_metadata, dict):
-                    vessel_metadata = json.dumps(vessel_metadata, indent=2)
+                    vessel_metadata = _json_dumps_pretty(vessel_metadata)
             else:
                 vessel_metadata = str(extraction_result)
                 vessel_details = []
@@ -416,8 +854,8 @@ class ChromeMCPClient:
                 content_snippet=vessel_metadata,
                 images_found=[],  # Could be enhanced
                 metadata_extracted={
-                    "content_file": content_file,
-                    "screenshot_path": screenshot_path,
+                    "content_file": page["content_file"],
+                    "screenshot_path": page["screenshot_path"],
                     "textContent": raw_content[:2000],
                     "details": vessel_details
                 }
@@ -444,10 +882,61 @@ class ChromeMCPClient:
                     
         return current_url
     
-    def _extract_page_content(self) -> str:
-        """Extract cleaned text content from the current page"""
+    def _extract_page_content(
+        self,
+        max_chars: int = _MAX_PAGE_CONTENT_CHARS,
+        settle_timeout: float = 2.0,
+        interval: float = 0.1,
+        max_interval: float = 0.8
+    ) -> str:
+        """
+        Extract cleaned text content from the current page once it stops changing.
+        
+        Pages that keep rendering after load (client-side apps, lazy sections)
+        are re-read with exponential backoff until two successive reads have
+        the same text length or settle_timeout passes. The last read is used,
+        so the readiness check costs no extra content calls on static pages
+        beyond the confirming one.
+        
+        Text nodes are collected only until max_chars is reached, so very
+        large pages are never concatenated in full just to be sliced.
+        
+        Args:
+            max_chars: Maximum number of characters to keep
+            settle_timeout: Maximum seconds to wait for the content to settle
+            interval: Initial seconds between reads, doubled after each read
+            max_interval: Upper bound on the seconds between reads
+            
+        Returns:
+            Page text, at most max_chars long
+        """
+        deadline = time.monotonic() + settle_timeout
+        raw_content, page_length = self._read_page_text(max_chars)
+        
+        while time.monotonic() + interval <= deadline:
+            time.sleep(interval)
+            interval = min(interval * 2, max_interval)
+            
+            previous_length = page_length
+            raw_content, page_length = self._read_page_text(max_chars)
+            if page_length == previous_length:
+                break
+        
+        return raw_content
+    
+    def _read_page_text(self, max_chars: int) -> Tuple[str, int]:
+        """
+        Read the current page text once.
+        
+        Args:
+            max_chars: Maximum number of characters to keep
+            
+        Returns:
+            Tuple of (page text, at most max_chars long; full text length of the page)
+        """
         content_result = self._call_mcp("chrome_get_web_content")
         raw_content = ""
+        page_length = 0
         
         if "result" in content_result and content_result["result"]:
             content_obj = content_result["result"]
@@ -455,28 +944,42 @@ class ChromeMCPClient:
                 content_list = content_obj["content"]
                 if isinstance(content_list, list):
                     content_parts = []
+                    total = 0
                     for item in content_list:
                         if isinstance(item, dict) and "text" in item:
-                            content_parts.append(item["text"])
-                    raw_content = " ".join(content_parts)
+                            text = item["text"]
+                            page_length += len(text) + 1
+                            if total < max_chars:
+                                content_parts.append(text)
+                                total += len(text) + 1
+                    raw_content = " ".join(content_parts)[:max_chars]
                     
-        return raw_content
+        return raw_content, page_length
     
     def _save_content_to_file(self, content: str, url: str, vessel_mmsi: str = "") -> str:
         """Save content to local file in vessel-specific directory"""
         try:
-            # Create vessel-specific folder
-            if vessel_mmsi:
-                search_dir = ensure_directory(f"reports/search_results/{vessel_mmsi}")
-            else:
-                search_dir = ensure_directory("reports/search_results")
+            # Create vessel-specific folder once per vessel
+            search_dir = self._search_dirs.get(vessel_mmsi)
+            if search_dir is None:
+                if vessel_mmsi:
+                    search_dir = ensure_directory(f"reports/search_results/{vessel_mmsi}")
+                else:
+                    search_dir = ensure_directory("reports/search_results")
+                self._search_dirs[vessel_mmsi] = search_dir
             
             # Generate filename
             safe_filename = sanitize_url_for_filename(url)
             filename = f"{search_dir}/{safe_filename}.html"
             
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(content)
+            # Encode once; a revisited page with unchanged content keeps its file
+            data = content.encode("utf-8", errors="replace")
+            if self._file_has_content(filename, data):
+                print(f"💾 Content unchanged, keeping {filename}")
+                return filename
+            
+            with open(filename, "wb", buffering=0) as f:
+                f.write(data)
             
             print(f"💾 Saved content to {filename}")
             return filename
@@ -485,6 +988,16 @@ class ChromeMCPClient:
             print(f"⚠️ Failed to save content file: {e}")
             return ""
     
+    def _file_has_content(self, filename: str, data: bytes) -> bool:
+        """Check whether filename already holds exactly data, comparing sizes before bytes"""
+        try:
+            if os.path.getsize(filename) != len(data):
+                return False
+            with open(filename, "rb") as f:
+                return f.read() == data
+        except OSError:
+            return False
+    
     def _extract_vessel_metadata_with_llm(self, content: str, query: str, url: str) -> Dict[str, Any]:
         """Use LLM to extract structured vessel metadata from page content"""
         if not self.llm:
@@ -493,12 +1006,19 @@ class ChromeMCPClient:
                 "details": []
             }
         
+        excerpt = _truncate_to_tokens(content, _METADATA_PROMPT_TOKENS)
+        cache_key = (content_digest(excerpt), query, url)
+        cached = self._metadata_cache.get(cache_key)
+        if cached is not None:
+            print("🧠 Reusing cached LLM metadata extraction")
+            return cached
+        
         metadata_prompt = f"""
         Extract comprehensive vessel metadata from this web page content in strict JSON format.
         
         Search Query: {query}
         Source URL: {url}
-        Content: {content[:8000]}
+        Content: {excerpt}
         
         Extract and structure the following vessel information with BOTH metadata AND details:
         {{
@@ -562,10 +1082,10 @@ class ChromeMCPClient:
                 ("user", metadata_prompt)
             ])
             
-            content_response = re.sub(r'<[^>]+>', '', response.content.strip())
+            content_response = _HTML_TAG_RE.sub('', response.content.strip())
             
             try:
-                vessel_data = json.loads(content_response)
+                vessel_data = _json_loads(content_response)
                 
                 if isinstance(vessel_data, dict) and "metadata" in vessel_data and "details" in vessel_data:
                     # Clean details array
@@ -576,6 +1096,7 @@ class ChromeMCPClient:
                     else:
                         vessel_data["details"] = []
                     
+                    self._metadata_cache.set(cache_key, vessel_data)
                     return vessel_data
                 else:
                     print("⚠️ LLM response missing metadata or details structure")
@@ -604,24 +1125,18 @@ class ChromeMCPClient:
         if not content:
             return []
             
-        lines = content.split('\n')
+        # Split off only the lines that are scanned, not the whole page
+        lines = content.split('\n', _DETAIL_SCAN_LINES)[:_DETAIL_SCAN_LINES]
         details = []
         
-        patterns = [
-            (r'(?i).*vessel\s+name[:\s]+(.*)', 'Vessel: {}'),
-            (r'(?i).*imo[:\s]+(\d+)', 'IMO: {}'),
-            (r'(?i).*mmsi[:\s]+(\d+)', 'MMSI: {}'),
-            (r'(?i).*length[:\s]+(\d+\.?\d*\s*m)', 'Length: {}'),
-            (r'(?i).*flag[:\s]+([^\n\r]{1,30})', 'Flag: {}'),
-            (r'(?i).*type[:\s]+([^\n\r]{1,40})', 'Type: {}')
-        ]
-        
-        for line in lines[:100]:
+        for line in lines:
+            if len(details) >= 4:
+                break
             line = line.strip()
             if 10 < len(line) < 150:
-                for pattern, format_str in patterns:
-                    match = re.search(pattern, line)
-                    if match and len(details) < 4:
+                for pattern, format_str in _DETAIL_PATTERNS:
+                    match = pattern.search(line)
+                    if match:
                         detail = format_str.format(match.group(1).strip())
                         if detail not in details:
                             details.append(detail[:80])
@@ -629,32 +1144,94 @@ class ChromeMCPClient:
         
         return details
     
-    def _handle_cookie_dialogs(self):
-        """Detect and handle cookie acceptance dialogs"""
-        try:
-            elements_result = self._call_mcp("chrome_get_interactive_elements")
+    def _await_ready(
+        self,
+        timeout: float = 3.0,
+        interval: float = 0.1,
+        max_interval: float = 0.8,
+        previous_url: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Poll the active tab until it has interactive elements and a stable URL.
+        
+        Replaces fixed page-load sleeps: returns as soon as the page is usable
+        and only waits the full timeout on pages that never settle. Polls start
+        fast and back off exponentially, so quick pages are caught early
+        without hammering slow ones. After a navigation, pass the URL it started
+        from: the old page is still showing (and stable) until the new one
+        commits, so it must not count as ready.
+        
+        Args:
+            timeout: Maximum seconds to wait
+            interval: Initial seconds between polls, doubled after each poll
+            max_interval: Upper bound on the seconds between polls
+            previous_url: URL shown before the navigation, or None when the URL
+                is not expected to change
             
-            if "result" in elements_result and elements_result["result"]:
-                elements_data = elements_result["result"]
-                elements = self._parse_elements_data(elements_data)
-                
-                cookie_terms = ["accept", "allow", "agree", "consent", "continue", "ok", "got it"]
+        Returns:
+            Elements from the last poll (empty if the page never had any)
+        """
+        deadline = time.monotonic() + timeout
+        last_url = None
+        delay = interval
+        
+        while True:
+            elements = self._get_elements(refresh=True)
+            if elements:
+                current_url = self._get_current_url()
+                if previous_url is not None and current_url == previous_url:
+                    # Navigation hasn't committed yet; keep backing off
+                    pass
+                elif current_url == last_url:
+                    return elements
+                else:
+                    last_url = current_url
+                    # The page has rendered; confirm the URL is stable after a short pause
+                    delay = interval
+            
+            if time.monotonic() + delay > deadline:
+                return elements
+            time.sleep(delay)
+            delay = min(delay * 2, max_interval)
+    
+    def _find_cookie_button(self, elements: List[Dict]) -> Optional[Dict]:
+        """Return the first cookie acceptance button among page elements"""
+        cookie_terms = ["accept", "allow", "agree", "consent", "continue", "ok", "got it"]
+        
+        for element in elements:
+            if isinstance(element, dict):
+                text = element.get("text", "").lower()
                 
-                for element in elements:
-                    if isinstance(element, dict):
-                        text = element.get("text", "").lower()
-                        elem_type = element.get("type", "")
-                        selector = element.get("selector", "")
-                        
-                        if (elem_type == "button" and
-                            element.get("isInteractive", False) and
-                            any(term in text for term in cookie_terms) and
-                            len(text) < 50):
-                            
-                            print(f"🍪 Found cookie dialog button: {text}")
-                            self._call_mcp("chrome_click_element", {"selector": selector})
-                            time.sleep(2)
-                            break
+                if (element.get("type", "") == "button" and
+                    element.get("isInteractive", False) and
+                    any(term in text for term in cookie_terms) and
+                    len(text) < 50):
+                    return element
+        
+        return None
+    
+    def _handle_cookie_dialogs(self, elements: Optional[List[Dict]] = None, timeout: float = 1.0):
+        """
+        Detect and handle cookie acceptance dialogs.
+        
+        Args:
+            elements: Already fetched interactive elements for the page
+            timeout: Seconds to keep looking for a late-appearing dialog
+        """
+        try:
+            deadline = time.monotonic() + timeout
+            if elements is None:
+                elements = self._get_elements()
+            
+            button = self._find_cookie_button(elements)
+            while button is None and time.monotonic() < deadline:
+                time.sleep(0.2)
+                button = self._find_cookie_button(self._get_elements(refresh=True))
+            
+            if button is not None:
+                print(f"🍪 Found cookie dialog button: {button.get('text', '').lower()}")
+                self._call_mcp("chrome_click_element", {"selector": button.get("selector", "")})
+                self._await_ready(timeout=1.0)
                             
         except Exception as e:
             print(f"⚠️ Cookie dialog handling failed: {e}")
@@ -678,7 +1255,7 @@ class ChromeMCPClient:
                 content = screenshot_result["result"]["content"]
                 if content and len(content) > 0 and "text" in content[0]:
                     try:
-                        screenshot_data = json.loads(content[0]["text"])
+                        screenshot_data = _json_loads(content[0]["text"])
                         
                         if screenshot_data.get("success") and "fullPath" in screenshot_data:
                             downloads_path = screenshot_data["fullPath"]
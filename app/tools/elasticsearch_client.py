@@ -5,13 +5,111 @@ Singleton service designed to be easily converted to MCP server in the future.
 Handles all vessel search, aggregation, and data retrieval operations.
 """
 
+import atexit
+import heapq
 import json
 import math
-from typing import List, Dict, Any, Optional
-from elasticsearch import Elasticsearch
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+from elasticsearch import BadRequestError, Elasticsearch
 
 from ..models.vessel import VesselData
-from ..utils.distance import calculate_distance_miles
+from ..utils.cache import LRUCache
+from ..utils.distance import (
+    longitude_bounds, track_distances_miles_batch, track_distance_upper_bounds_miles, EARTH_RADIUS_MILES
+)
+
+try:
+    import orjson
+    from elastic_transport import OrjsonSerializer
+
+    # Aggregation responses run to megabytes of nested buckets; orjson parses
+    # them several times faster than the stdlib serializer the client defaults
+    # to. Registering it for application/json also covers the compatibility
+    # mimetype Elasticsearch 8 responds with.
+    _CLIENT_SERIALIZERS = {"application/json": OrjsonSerializer()}
+
+    def _canonical_json(body: Dict[str, Any]) -> bytes:
+        return orjson.dumps(body, option=orjson.OPT_SORT_KEYS)
+except ImportError:  # orjson is pinned in requirements.txt; keep the client default otherwise
+    _CLIENT_SERIALIZERS = None
+
+    def _canonical_json(body: Dict[str, Any]) -> str:
+        return json.dumps(body, sort_keys=True, separators=(",", ":"))
+
+
+# Painless reduce step for server-side track distance: orders the points
+# collected from every shard by timestamp and folds the Haversine formula
+_TRACK_MILES_REDUCE_SCRIPT = """
+List points = new ArrayList();
+for (s in states) { if (s != null) { points.addAll(s); } }
+points.sort((p1, p2) -> Long.compare((long) p1[0], (long) p2[0]));
+double total = 0;
+for (int i = 1; i < points.size(); i++) {
+    double lat1 = Math.toRadians((double) points[i - 1][1]);
+    double lat2 = Math.toRadians((double) points[i][1]);
+    double dlat = lat2 - lat1;
+    double dlon = Math.toRadians((double) points[i][2] - (double) points[i - 1][2]);
+    double a = Math.pow(Math.sin(dlat / 2), 2) + Math.cos(lat1) * Math.cos(lat2) * Math.pow(Math.sin(dlon / 2), 2);
+    total += 2 * params.radius * Math.asin(Math.sqrt(a));
+}
+return total;
+"""
+
+# Painless bucket_selector mirroring track_distance_upper_bound_miles: keeps a
+# vessel only if (cells - 1) segments spanning its bounding box could reach the threshold
+_TRACK_BOUND_SELECTOR_SCRIPT = """
+if (params.cells < 2) { return false; }
+double widest = (params.minLat <= 0 && params.maxLat >= 0)
+    ? 1.0 : Math.cos(Math.toRadians(Math.min(Math.abs(params.minLat), Math.abs(params.maxLat))));
+double lonSpan = params.maxLon - params.minLon;
+if (lonSpan < 0) { lonSpan += 360.0; }
+lonSpan = Math.min(lonSpan, 180.0);
+double dlat = Math.toRadians(params.maxLat - params.minLat);
+double dlon = widest * Math.toRadians(lonSpan);
+double segment = params.radius * Math.sqrt(dlat * dlat + dlon * dlon);
+segment = Math.min(segment, Math.PI * params.radius);
+return (params.cells - 1) * segment >= params.min_miles;
+"""
+
+# Buckets returned per MMSI terms page; partitions are sized to fit in one page
+_TERMS_PAGE_SIZE = 1000
+
+# Partitions are hash-based, so leave room for uneven slices
+_PARTITION_HEADROOM = 1.25
+
+# Times a partition that still overflows its terms page is halved again
+_MAX_PARTITION_SPLITS = 3
+
+# A day's vessels are a small slice of the MMSI terms in the index, so the
+# vessels aggregations hash the matching values ("map") instead of building
+# global ordinals over the whole field
+_MMSI_EXECUTION_HINT = "map"
+
+# Geohash precision 5 gives ~4.9km x 4.9km cells
+_GEOHASH_PRECISION = 5
+
+# Response parts each search reads; Elasticsearch drops the rest (shard
+# headers, hit totals, bucket doc counts, unused stats) before serializing
+_COUNT_FILTER_PATH = ("aggregations.vessel_count.value",)
+_CANDIDATE_FILTER_PATH = (
+    "aggregations.vessels.sum_other_doc_count",
+    "aggregations.vessels.buckets.key",
+    "aggregations.vessels.buckets.vessel_info.hits.hits._source",
+    "aggregations.vessels.buckets.track_miles.value",
+)
+_TRACK_FILTER_PATH = (
+    "aggregations.vessels.buckets.key",
+    "aggregations.vessels.buckets.geohash_grid.buckets.representative_point.hits.hits.fields",
+)
+
+# Routes repeated searches to the same shard copies so their request caches are reused
+_SEARCH_PREFERENCE = "vessel-search"
+
+# Candidate vessels per pass-2 track search
+_TRACK_FETCH_CHUNK = 200
 
 
 class ElasticsearchService:
@@ -36,7 +134,10 @@ class ElasticsearchService:
         host: str = "http://localhost:9200",
         vessel_index: str = "ais_data",
         timeout: int = 60,
-        max_retries: int = 3
+        max_retries: int = 3,
+        max_parallel_searches: int = 4,
+        response_cache_size: int = 64,
+        response_cache_ttl: float = 300.0
     ):
         """Initialize Elasticsearch client (only once due to singleton)"""
         if self._initialized:
@@ -44,18 +145,56 @@ class ElasticsearchService:
             
         self.host = host
         self.vessel_index = vessel_index
-        self.client = Elasticsearch([host], timeout=timeout, max_retries=max_retries)
+        self.max_parallel_searches = max_parallel_searches
+        
+        # One keep-alive connection pool shared by every call (and every
+        # parallel partition search) for the lifetime of the process; it is
+        # created on first use so importing the tools doesn't build a transport
+        self._client_options = {
+            "request_timeout": timeout,
+            "max_retries": max_retries,
+            "retry_on_timeout": True,
+            "http_compress": True,
+            "connections_per_node": max(16, max_parallel_searches)
+        }
+        if _CLIENT_SERIALIZERS is not None:
+            self._client_options["serializers"] = _CLIENT_SERIALIZERS
+        self._client: Optional[Elasticsearch] = None
+        self._client_lock = threading.Lock()
+        
+        # Field used for geohash cells, probed from the index mapping on first search
+        self._geo_field: Optional[str] = None
+        
+        # AIS history is write-once, so identical searches can reuse recent responses
+        self._response_cache = LRUCache(maxsize=response_cache_size, ttl_seconds=response_cache_ttl)
         self._initialized = True
         
         print(f"🔌 ElasticsearchService initialized: {host}")
     
+    @property
+    def client(self) -> Elasticsearch:
+        """Shared Elasticsearch client, created on first access"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    client = Elasticsearch([self.host], **self._client_options)
+                    atexit.register(client.close)
+                    self._client = client
+        return self._client
+    
+    @client.setter
+    def client(self, client: Elasticsearch):
+        self._client = client
+    
     # Future MCP Server Endpoints
     
     def search_vessels_by_distance(
         self, 
         min_distance_miles: float = 50.0, 
         date: str = "2022-01-01", 
-        scroll_batches: int = 5
+        scroll_batches: int = 5,
+        server_side_distance: bool = False,
+        top_k: int = 3
     ) -> List[VesselData]:
         """
         [Future MCP Endpoint] Search for vessels with long tracks using geohash aggregation.
@@ -63,97 +202,37 @@ class ElasticsearchService:
         Args:
             min_distance_miles: Minimum distance threshold
             date: Analysis date (YYYY-MM-DD format)
-            scroll_batches: Number of batches to process
+            scroll_batches: Minimum number of disjoint MMSI partitions to query (fetched
+                in parallel); raised when the day has too many vessels for one terms page
+            server_side_distance: Compute track distance in Elasticsearch with a
+                Painless scripted_metric and drop short tracks before they are returned
+            top_k: Number of longest-track vessels to return
             
         Returns:
             List of VesselData objects sorted by distance
         """
         print(f"🔍 Searching vessels with minimum {min_distance_miles} miles on {date}")
         
-        # Geohash precision 5 gives ~4.9km x 4.9km cells
-        geohash_query = self._build_geohash_query(date)
-        fallback_query = self._build_fallback_query(date)
+        num_partitions = self._plan_partitions(date, scroll_batches)
         
-        all_vessels: Dict[str, Dict] = {}
-        processed_batches = 0
-        
-        try:
-            # First attempt with geo_point field
-            try:
-                response = self.client.search(index=self.vessel_index, body=geohash_query)
-                current_query = geohash_query
-            except Exception:
-                print("⚠️ Using fallback geohash query with LAT field")
-                response = self.client.search(index=self.vessel_index, body=fallback_query)
-                current_query = fallback_query
-                
-            # Process first batch
-            vessels_batch = self._process_geohash_batch(response, min_distance_miles)
-            all_vessels.update(vessels_batch)
-            processed_batches += 1
-            
-            print(f"✅ Processed batch {processed_batches}: {len(vessels_batch)} qualifying vessels")
-            
-            # Process additional scroll batches
-            scroll_id = None
-            while processed_batches < scroll_batches:
-                try:
-                    if scroll_id:
-                        response = self.client.scroll(scroll_id=scroll_id, scroll="2m")
-                    else:
-                        response = self.client.search(
-                            index=self.vessel_index,
-                            body=current_query,
-                            scroll="2m",
-                            size=0
-                        )
-                    
-                    scroll_id = response.get("_scroll_id")
-                    
-                    if not response.get("aggregations"):
-                        break
-                        
-                    vessels_batch = self._process_geohash_batch(response, min_distance_miles)
-                    all_vessels.update(vessels_batch)
-                    processed_batches += 1
-                    
-                    print(f"✅ Processed batch {processed_batches}: {len(vessels_batch)} qualifying vessels")
-                    
-                except Exception as e:
-                    print(f"❌ Scroll batch {processed_batches + 1} failed: {e}")
-                    break
-            
-            # Clean up scroll context
-            if scroll_id:
-                try:
-                    self.client.clear_scroll(scroll_id=scroll_id)
-                except Exception:
-                    pass
-            
-        except Exception as e:
-            print(f"❌ Elasticsearch query failed: {e}")
+        # Pass 1: cheap per-vessel stats; vessels that cannot qualify are dropped in Elasticsearch
+        candidates, geo_field = self._find_candidates(
+            date, self._resolve_geo_field(), min_distance_miles, num_partitions, server_side_distance
+        )
+        if candidates is None:
             return []
         
-        # Convert to VesselData objects and sort by distance
-        vessel_list = []
-        for mmsi, vessel_data in all_vessels.items():
-            vessel = VesselData(
-                mmsi=mmsi,
-                vessel_name=vessel_data.get("vessel_name", ""),
-                imo=vessel_data.get("imo", ""),
-                call_sign=vessel_data.get("call_sign", ""),
-                vessel_type=vessel_data.get("vessel_type", ""),
-                length=vessel_data.get("length"),
-                width=vessel_data.get("width"), 
-                draft=vessel_data.get("draft"),
-                track_points=vessel_data.get("track_points", []),
-                total_distance_miles=vessel_data.get("total_distance_miles", 0.0)
-            )
-            vessel_list.append(vessel)
+        # Pass 2: representative track points only for the surviving vessels
+        if server_side_distance:
+            top_entries = self._fetch_ranked_tracks(date, geo_field, candidates, min_distance_miles, top_k)
+        else:
+            top_entries = self._fetch_tracks(date, geo_field, candidates, min_distance_miles, top_k)
         
-        # Sort by distance and return top 3
-        vessel_list.sort(key=lambda x: x.total_distance_miles, reverse=True)
-        top_vessels = vessel_list[:3]
+        # Metadata fields and track point dicts are only materialized for the vessels returned
+        top_vessels = [
+            self._to_vessel_data(mmsi, candidates[mmsi]["metadata"], vessel_data)
+            for mmsi, vessel_data in top_entries
+        ]
         
         print(f"🎯 Final results: {len(top_vessels)} vessels with tracks >= {min_distance_miles} miles")
         for i, vessel in enumerate(top_vessels, 1):
@@ -179,23 +258,141 @@ class ElasticsearchService:
     
     # Private helper methods
     
-    def _build_geohash_query(self, date: str) -> Dict[str, Any]:
-        """Build geohash aggregation query for geo_point field"""
+    def _search(self, body: Dict[str, Any], filter_path: Tuple[str, ...]) -> Dict[str, Any]:
+        """
+        Run a search against the vessel index, reusing a cached response if fresh.
+        
+        Responses are keyed on the canonical JSON of the request body, so any
+        change to the query (date, partition, threshold, MMSI chunk) is a miss.
+        
+        Args:
+            body: Elasticsearch search body
+            filter_path: Response paths to keep; everything else is pruned server-side
+            
+        Returns:
+            Search response (empty when nothing matched filter_path)
+        """
+        cache_key = (self.vessel_index, filter_path, _canonical_json(body))
+        response = self._response_cache.get(cache_key)
+        if response is None:
+            response = self.client.search(
+                index=self.vessel_index,
+                body=body,
+                filter_path=list(filter_path),
+                preference=_SEARCH_PREFERENCE
+            )
+            self._response_cache.set(cache_key, response)
+        return response
+    
+    def clear_cache(self):
+        """Drop cached search responses, e.g. after new AIS data is indexed"""
+        self._response_cache.clear()
+    
+    def _date_range_query(self, date: str) -> Dict[str, Any]:
+        """Build the BaseDateTime range filter covering one day"""
         return {
-            "query": {
-                "range": {
-                    "BaseDateTime": {
-                        "gte": f"{date}T00:00:00",
-                        "lte": f"{date}T23:59:59"
+            "range": {
+                "BaseDateTime": {
+                    "gte": f"{date}T00:00:00",
+                    "lte": f"{date}T23:59:59"
+                }
+            }
+        }
+    
+    def _resolve_geo_field(self) -> str:
+        """
+        Return the field to build geohash cells from, probing the mapping once.
+        
+        Indices with a geo_point "location" field use it; older imports without
+        one fall back to the LAT field. The result is cached for the process.
+        
+        Returns:
+            "location" or "LAT"
+        """
+        if self._geo_field is not None:
+            return self._geo_field
+        
+        try:
+            mapping = self.client.indices.get_mapping(index=self.vessel_index)
+        except Exception as e:
+            # Not cached: let the search itself surface connection problems
+            print(f"⚠️ Could not read mapping for {self.vessel_index}: {e}")
+            return "location"
+        
+        has_geo_point = any(
+            index_mapping.get("mappings", {}).get("properties", {}).get("location", {}).get("type") == "geo_point"
+            for index_mapping in mapping.values()
+        )
+        self._geo_field = "location" if has_geo_point else "LAT"
+        return self._geo_field
+    
+    def _plan_partitions(self, date: str, min_partitions: int) -> int:
+        """
+        Choose how many MMSI partitions are needed to cover every vessel of a day.
+        
+        A terms aggregation returns at most one page of buckets per request, so
+        the partition count is sized from an MMSI cardinality estimate such that
+        each partition fits in a single page.
+        
+        Args:
+            date: Analysis date (YYYY-MM-DD format)
+            min_partitions: Lower bound on the number of partitions
+            
+        Returns:
+            Number of partitions to query
+        """
+        try:
+            response = self._search({
+                "query": self._date_range_query(date),
+                "size": 0,
+                "aggs": {
+                    "vessel_count": {
+                        "cardinality": {
+                            "field": "MMSI.keyword",
+                            "precision_threshold": 40000
+                        }
                     }
                 }
-            },
+            }, _COUNT_FILTER_PATH)
+            vessel_count = response["aggregations"]["vessel_count"]["value"]
+        except Exception as e:
+            print(f"⚠️ Vessel count failed, using {min_partitions} partitions: {e}")
+            return min_partitions
+        
+        needed = math.ceil(vessel_count * _PARTITION_HEADROOM / _TERMS_PAGE_SIZE)
+        num_partitions = max(min_partitions, needed)
+        print(f"📊 ~{vessel_count} vessels on {date}, querying {num_partitions} partitions")
+        return num_partitions
+    
+    def _build_candidate_query(
+        self, date: str, geo_field: str, min_distance_miles: float, server_side_distance: bool
+    ) -> Dict[str, Any]:
+        """
+        Build the pass-1 query: vessel metadata plus a server-side vessel filter.
+        
+        No track points are fetched here; only vessels passing the filter are
+        looked up again by _build_track_query.
+        
+        Args:
+            date: Analysis date (YYYY-MM-DD format)
+            geo_field: Field the geohash grid is built on ("location" geo_point,
+                or "LAT" for indices imported without one)
+            min_distance_miles: Minimum distance threshold
+            server_side_distance: Filter on the exact Painless track distance
+                instead of the bounding-box upper bound
+        
+        Returns:
+            Elasticsearch search body
+        """
+        query = {
+            "query": self._date_range_query(date),
             "size": 0,
             "aggs": {
                 "vessels": {
                     "terms": {
                         "field": "MMSI.keyword",
-                        "size": 1000
+                        "size": _TERMS_PAGE_SIZE,
+                        "execution_hint": _MMSI_EXECUTION_HINT
                     },
                     "aggs": {
                         "vessel_info": {
@@ -203,36 +400,34 @@ class ElasticsearchService:
                                 "size": 1,
                                 "_source": ["VesselName", "IMO", "CallSign", "VesselType", "Length", "Width", "Draft"]
                             }
-                        },
-                        "geohash_grid": {
-                            "geohash_grid": {
-                                "field": "location",
-                                "precision": 5
-                            },
-                            "aggs": {
-                                "representative_point": {
-                                    "top_hits": {
-                                        "size": 1,
-                                        "sort": [{"BaseDateTime": {"order": "asc"}}],
-                                        "_source": ["BaseDateTime", "LAT", "LON"]
-                                    }
-                                }
-                            }
                         }
                     }
                 }
             }
         }
+        if server_side_distance:
+            return self._add_server_side_distance(query, min_distance_miles)
+        return self._add_track_bound_filter(query, geo_field, min_distance_miles)
     
-    def _build_fallback_query(self, date: str) -> Dict[str, Any]:
-        """Build fallback query using LAT field for geohash"""
+    def _build_track_query(self, date: str, geo_field: str, mmsis: List[str]) -> Dict[str, Any]:
+        """
+        Build the pass-2 query fetching one representative point per geohash cell.
+        
+        Args:
+            date: Analysis date (YYYY-MM-DD format)
+            geo_field: Field the geohash grid is built on
+            mmsis: Candidate vessels to fetch tracks for
+        
+        Returns:
+            Elasticsearch search body
+        """
         return {
             "query": {
-                "range": {
-                    "BaseDateTime": {
-                        "gte": f"{date}T00:00:00",
-                        "lte": f"{date}T23:59:59"
-                    }
+                "bool": {
+                    "filter": [
+                        self._date_range_query(date),
+                        {"terms": {"MMSI.keyword": mmsis}}
+                    ]
                 }
             },
             "size": 0,
@@ -240,27 +435,36 @@ class ElasticsearchService:
                 "vessels": {
                     "terms": {
                         "field": "MMSI.keyword",
-                        "size": 1000
+                        "include": mmsis,
+                        "size": len(mmsis),
+                        "execution_hint": _MMSI_EXECUTION_HINT
                     },
                     "aggs": {
-                        "vessel_info": {
-                            "top_hits": {
-                                "size": 1,
-                                "_source": ["VesselName", "IMO", "CallSign", "VesselType", "Length", "Width", "Draft"]
-                            }
-                        },
                         "geohash_grid": {
                             "geohash_grid": {
-                                "field": "LAT",
-                                "precision": 5
+                                "field": geo_field,
+                                "precision": _GEOHASH_PRECISION
                             },
                             "aggs": {
                                 "representative_point": {
                                     "top_hits": {
                                         "size": 1,
                                         "sort": [{"BaseDateTime": {"order": "asc"}}],
-                                        "_source": ["BaseDateTime", "LAT", "LON"]
+                                        # Read columnar doc values instead of decoding _source
+                                        "_source": False,
+                                        "docvalue_fields": [
+                                            {"field": "BaseDateTime", "format": "epoch_millis"},
+                                            "LAT",
+                                            "LON"
+                                        ]
                                     }
+                                },
+                                # Cells come back busiest first; the representative point is each
+                                # cell's earliest hit, so ordering cells by that time emits the
+                                # track already in time order
+                                "first_seen": {"min": {"field": "BaseDateTime"}},
+                                "time_order": {
+                                    "bucket_sort": {"sort": [{"first_seen": {"order": "asc"}}]}
                                 }
                             }
                         }
@@ -269,81 +473,468 @@ class ElasticsearchService:
             }
         }
     
-    def _process_geohash_batch(self, response: Dict, min_distance_miles: float) -> Dict[str, Dict]:
-        """Process a single batch of geohash aggregation results"""
-        vessels_batch = {}
+    def _find_candidates(
+        self,
+        date: str,
+        geo_field: str,
+        min_distance_miles: float,
+        num_partitions: int,
+        server_side_distance: bool
+    ) -> Tuple[Optional[Dict[str, Dict]], str]:
+        """
+        Run pass 1 over every MMSI partition and collect the surviving vessels.
         
-        if not response.get("aggregations", {}).get("vessels", {}).get("buckets"):
-            return vessels_batch
+        Args:
+            date: Analysis date (YYYY-MM-DD format)
+            geo_field: Field the geohash grid is built on
+            min_distance_miles: Minimum distance threshold
+            num_partitions: Number of disjoint MMSI partitions to query
+            server_side_distance: Filter on the exact Painless track distance
         
-        for vessel_bucket in response["aggregations"]["vessels"]["buckets"]:
-            mmsi = vessel_bucket["key"]
+        Returns:
+            Tuple of (candidates by MMSI, or None if the search failed; geo field used)
+        """
+        query = self._build_candidate_query(date, geo_field, min_distance_miles, server_side_distance)
+        
+        try:
+            try:
+                response = self._search(self._with_partition(query, 0, num_partitions), _CANDIDATE_FILTER_PATH)
+            except BadRequestError:
+                if geo_field != "location":
+                    raise
+                # Mapping says geo_point but the cluster rejected the aggregation
+                print("⚠️ Using fallback geohash query with LAT field")
+                self._geo_field = geo_field = "LAT"
+                query = self._build_candidate_query(date, geo_field, min_distance_miles, server_side_distance)
+                response = self._search(self._with_partition(query, 0, num_partitions), _CANDIDATE_FILTER_PATH)
+        except Exception as e:
+            print(f"❌ Elasticsearch query failed: {e}")
+            return None, geo_field
+        
+        candidates = self._collect_candidates(response)
+        print(f"✅ Scanned partition 1/{num_partitions}: {len(candidates)} candidate vessels")
+        overflowed = [(0, num_partitions)] if self._terms_overflowed(response) else []
+        
+        # Remaining partitions are disjoint MMSI slices, so they can be fetched concurrently
+        slices = [(partition, num_partitions) for partition in range(1, num_partitions)]
+        for split in range(_MAX_PARTITION_SPLITS + 1):
+            if slices:
+                batch, batch_overflowed = self._scan_partitions(query, slices)
+                candidates.update(batch)
+                overflowed.extend(batch_overflowed)
+            if not overflowed:
+                break
+            if split == _MAX_PARTITION_SPLITS:
+                print(f"⚠️ {len(overflowed)} partitions still exceed one terms page; some vessels were not scanned")
+                break
+            
+            # Partition p of n holds exactly the terms of partitions p and p + n of 2n,
+            # so only the slices that overflowed their page are scanned again
+            print(f"🔀 Splitting {len(overflowed)} partitions that exceeded one terms page")
+            slices = [
+                (part, 2 * count)
+                for partition, count in overflowed
+                for part in (partition, partition + count)
+            ]
+            overflowed = []
+        
+        return candidates, geo_field
+    
+    def _scan_partitions(
+        self, query: Dict[str, Any], slices: List[Tuple[int, int]]
+    ) -> Tuple[Dict[str, Dict], List[Tuple[int, int]]]:
+        """
+        Run the pass-1 query over MMSI hash partitions in parallel.
+        
+        Args:
+            query: Pass-1 search body without a partition
+            slices: (partition, num_partitions) pairs to scan
+        
+        Returns:
+            Tuple of (candidates by MMSI; slices whose terms did not fit in one page)
+        """
+        candidates: Dict[str, Dict] = {}
+        overflowed: List[Tuple[int, int]] = []
+        
+        max_workers = min(len(slices), self.max_parallel_searches)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._search,
+                    self._with_partition(query, partition, num_partitions),
+                    _CANDIDATE_FILTER_PATH
+                ): (partition, num_partitions)
+                for partition, num_partitions in slices
+            }
             
-            # Extract vessel metadata
+            for future in as_completed(futures):
+                partition, num_partitions = futures[future]
+                try:
+                    response = future.result()
+                except Exception as e:
+                    print(f"❌ Partition {partition + 1}/{num_partitions} failed: {e}")
+                    continue
+                
+                if self._terms_overflowed(response):
+                    overflowed.append((partition, num_partitions))
+                batch = self._collect_candidates(response)
+                candidates.update(batch)
+                print(f"✅ Scanned partition {partition + 1}/{num_partitions}: {len(batch)} candidate vessels")
+        
+        return candidates, overflowed
+    
+    def _terms_overflowed(self, response: Dict) -> bool:
+        """Whether the vessels terms aggregation left MMSIs out of its page"""
+        return response.get("aggregations", {}).get("vessels", {}).get("sum_other_doc_count", 0) > 0
+    
+    def _collect_candidates(self, response: Dict) -> Dict[str, Dict]:
+        """Extract vessel metadata (and server-side distance, if any) from a pass-1 response"""
+        candidates = {}
+        
+        for vessel_bucket in response.get("aggregations", {}).get("vessels", {}).get("buckets", []):
             vessel_info_hits = vessel_bucket["vessel_info"]["hits"]["hits"]
             if not vessel_info_hits:
                 continue
+            
+            candidates[vessel_bucket["key"]] = {
+                "metadata": vessel_info_hits[0]["_source"],
+                "server_miles": vessel_bucket.get("track_miles", {}).get("value")
+            }
+        
+        return candidates
+    
+    def _fetch_tracks(
+        self, date: str, geo_field: str, candidates: Dict[str, Dict], min_distance_miles: float, top_k: int
+    ) -> List[Tuple[str, Dict]]:
+        """
+        Run pass 2: fetch tracks for candidate vessels in parallel chunks.
+        
+        Only the top_k longest tracks are retained while batches arrive, so
+        arrays of vessels that cannot make the result are released early.
+        
+        Args:
+            date: Analysis date (YYYY-MM-DD format)
+            geo_field: Field the geohash grid is built on
+            candidates: Pass-1 candidates by MMSI
+            min_distance_miles: Minimum distance threshold
+            top_k: Number of longest-track vessels to keep
+        
+        Returns:
+            (MMSI, vessel data) pairs of the top_k qualifying vessels, longest first
+        """
+        # Sorted so chunk bodies (and their cache keys) don't depend on partition arrival order
+        mmsis = sorted(candidates)
+        chunks = [mmsis[i:i + _TRACK_FETCH_CHUNK] for i in range(0, len(mmsis), _TRACK_FETCH_CHUNK)]
+        if not chunks or top_k <= 0:
+            return []
+        
+        # Min-heap of (distance, mmsi, data); the unique MMSI keeps dicts from being compared
+        top_heap: List[Tuple[float, str, Dict]] = []
+        qualifying = 0
+        
+        max_workers = min(len(chunks), self.max_parallel_searches)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._search,
+                    self._build_track_query(date, geo_field, chunk),
+                    _TRACK_FILTER_PATH
+                ): chunk_number
+                for chunk_number, chunk in enumerate(chunks, 1)
+            }
+            
+            for future in as_completed(futures):
+                chunk_number = futures[future]
+                try:
+                    response = future.result()
+                except Exception as e:
+                    print(f"❌ Track batch {chunk_number}/{len(chunks)} failed: {e}")
+                    continue
                 
-            vessel_metadata = vessel_info_hits[0]["_source"]
+                vessels_batch = self._process_geohash_batch(response, candidates, min_distance_miles)
+                qualifying += len(vessels_batch)
+                for mmsi, vessel_data in vessels_batch.items():
+                    entry = (vessel_data["total_distance_miles"], mmsi, vessel_data)
+                    if len(top_heap) < top_k:
+                        heapq.heappush(top_heap, entry)
+                    elif entry > top_heap[0]:
+                        heapq.heapreplace(top_heap, entry)
+                print(f"✅ Processed track batch {chunk_number}/{len(chunks)}: {len(vessels_batch)} qualifying vessels")
+        
+        print(f"📊 {qualifying} vessels qualified; keeping the top {len(top_heap)}")
+        return [(mmsi, vessel_data) for _, mmsi, vessel_data in sorted(top_heap, reverse=True)]
+    
+    def _fetch_ranked_tracks(
+        self, date: str, geo_field: str, candidates: Dict[str, Dict], min_distance_miles: float, top_k: int
+    ) -> List[Tuple[str, Dict]]:
+        """
+        Run pass 2 for server-side distances: fetch tracks only for the top_k vessels.
+        
+        Pass-1 distances from Elasticsearch are already final, so vessels are
+        ranked on them and tracks are fetched for the next top_k at a time,
+        going further down the ranking only when a vessel drops out in pass 2
+        (e.g. all of its points fall in one geohash cell).
+        
+        Args:
+            date: Analysis date (YYYY-MM-DD format)
+            geo_field: Field the geohash grid is built on
+            candidates: Pass-1 candidates by MMSI, each with its server-side distance
+            min_distance_miles: Minimum distance threshold
+            top_k: Number of longest-track vessels to keep
+        
+        Returns:
+            (MMSI, vessel data) pairs of the top_k qualifying vessels, longest first
+        """
+        if any(candidate["server_miles"] is None for candidate in candidates.values()):
+            return self._fetch_tracks(date, geo_field, candidates, min_distance_miles, top_k)
+        
+        # Heapified rather than sorted: usually only the first top_k are ever taken
+        ranking = [(-candidate["server_miles"], mmsi) for mmsi, candidate in candidates.items()]
+        heapq.heapify(ranking)
+        top_entries: List[Tuple[str, Dict]] = []
+        
+        while len(top_entries) < top_k and ranking:
+            needed = top_k - len(top_entries)
+            window = {}
+            while ranking and len(window) < needed:
+                _, mmsi = heapq.heappop(ranking)
+                window[mmsi] = candidates[mmsi]
+            # Windows are taken in ranking order, so the results stay longest first
+            top_entries.extend(self._fetch_tracks(date, geo_field, window, min_distance_miles, needed))
+        
+        return top_entries
+    
+    def _with_partition(self, query: Dict[str, Any], partition: int, num_partitions: int) -> Dict[str, Any]:
+        """Restrict the MMSI terms aggregation of a query to one hash partition"""
+        vessels_agg = dict(query["aggs"]["vessels"])
+        vessels_agg["terms"] = {
+            **vessels_agg["terms"],
+            "include": {"partition": partition, "num_partitions": num_partitions}
+        }
+        return {**query, "aggs": {**query["aggs"], "vessels": vessels_agg}}
+    
+    def _add_server_side_distance(self, query: Dict[str, Any], min_distance_miles: float) -> Dict[str, Any]:
+        """Add per-vessel track distance and a distance filter computed by Elasticsearch"""
+        vessel_aggs = query["aggs"]["vessels"]["aggs"]
+        vessel_aggs["track_miles"] = {
+            "scripted_metric": {
+                "init_script": "state.points = []",
+                "map_script": (
+                    "state.points.add([doc['BaseDateTime'].value.toInstant().toEpochMilli(), "
+                    "doc['LAT'].value, doc['LON'].value])"
+                ),
+                "combine_script": "return state.points",
+                "reduce_script": _TRACK_MILES_REDUCE_SCRIPT,
+                "params": {"radius": EARTH_RADIUS_MILES}
+            }
+        }
+        vessel_aggs["distance_filter"] = {
+            "bucket_selector": {
+                "buckets_path": {"miles": "track_miles.value"},
+                "script": {
+                    "source": "params.miles >= params.min_miles",
+                    "params": {"min_miles": min_distance_miles}
+                }
+            }
+        }
+        return query
+    
+    def _to_vessel_data(self, mmsi: str, vessel_metadata: Dict[str, Any], vessel_data: Dict[str, Any]) -> VesselData:
+        """Combine pass-1 metadata and a pass-2 track into a VesselData"""
+        return VesselData(
+            mmsi=mmsi,
+            vessel_name=vessel_metadata.get("VesselName", ""),
+            imo=vessel_metadata.get("IMO", ""),
+            call_sign=vessel_metadata.get("CallSign", ""),
+            vessel_type=str(vessel_metadata.get("VesselType", "")),
+            length=vessel_metadata.get("Length"),
+            width=vessel_metadata.get("Width"),
+            draft=vessel_metadata.get("Draft"),
+            track_points=self._to_track_points(vessel_data["timestamps"], vessel_data["lats"], vessel_data["lons"]),
+            total_distance_miles=vessel_data["total_distance_miles"]
+        )
+    
+    def _to_track_points(self, timestamps: np.ndarray, lats: np.ndarray, lons: np.ndarray) -> List[Dict[str, Any]]:
+        """Build VesselData track point dicts from column arrays in track order"""
+        # Epoch millis are formatted back to BaseDateTime's ISO form only for reported vessels
+        iso_timestamps = np.datetime_as_string(timestamps.astype("datetime64[ms]").astype("datetime64[s]"))
+        return [
+            {"timestamp": timestamp, "lat": lat, "lon": lon}
+            for timestamp, lat, lon in zip(iso_timestamps.tolist(), lats.tolist(), lons.tolist())
+        ]
+    
+    def _add_track_bound_filter(self, query: Dict[str, Any], geo_field: str, min_distance_miles: float) -> Dict[str, Any]:
+        """
+        Drop vessels that cannot reach the distance threshold inside Elasticsearch.
+        
+        Adds per-vessel bounds (geo_bounds on the geo_point field, else LAT/LON
+        stats) and a bucket_selector evaluating the same bounding-box upper
+        bound as track_distance_upper_bound_miles over the vessel's geohash
+        cell count, so rejected vessels (and their top_hits) never reach the
+        client.
+        """
+        vessel_aggs = query["aggs"]["vessels"]["aggs"]
+        vessel_aggs["cells"] = {"geohash_grid": {"field": geo_field, "precision": _GEOHASH_PRECISION}}
+        if geo_field == "location":
+            # One geo_bounds pass over the geo_point replaces two stats passes over LAT and LON;
+            # with wrapping, a track crossing the antimeridian gets its narrow box (left > right)
+            # instead of one spanning the globe
+            vessel_aggs["bounds"] = {"geo_bounds": {"field": geo_field, "wrap_longitude": True}}
+            bounds_path = {
+                "minLat": "bounds.bottom",
+                "maxLat": "bounds.top",
+                "minLon": "bounds.left",
+                "maxLon": "bounds.right"
+            }
+        else:
+            vessel_aggs["lat_stats"] = {"stats": {"field": "LAT"}}
+            vessel_aggs["lon_stats"] = {"stats": {"field": "LON"}}
+            bounds_path = {
+                "minLat": "lat_stats.min",
+                "maxLat": "lat_stats.max",
+                "minLon": "lon_stats.min",
+                "maxLon": "lon_stats.max"
+            }
+        vessel_aggs["track_bound_filter"] = {
+            "bucket_selector": {
+                "buckets_path": {"cells": "cells._bucket_count", **bounds_path},
+                "script": {
+                    "source": _TRACK_BOUND_SELECTOR_SCRIPT,
+                    "params": {"min_miles": min_distance_miles, "radius": EARTH_RADIUS_MILES}
+                }
+            }
+        }
+        return query
+    
+    def _process_geohash_batch(
+        self, response: Dict, candidates: Dict[str, Dict], min_distance_miles: float
+    ) -> Dict[str, Dict]:
+        """Process a single batch of pass-2 geohash aggregation results"""
+        vessels_batch = {}
+        
+        vessel_buckets = response.get("aggregations", {}).get("vessels", {}).get("buckets")
+        if not vessel_buckets:
+            return vessels_batch
+        
+        # Struct-of-arrays layout: every track in the batch is written back to back
+        # into shared columns (at most one point per geohash cell), and a track is
+        # just its [start, end) slice, so the batch-wide steps below read them in place
+        capacity = sum(len(bucket.get("geohash_grid", {}).get("buckets", ())) for bucket in vessel_buckets)
+        lats = np.empty(capacity, dtype=np.float64)
+        lons = np.empty(capacity, dtype=np.float64)
+        timestamps = np.empty(capacity, dtype=np.int64)
+        tracks = []
+        track_fields = []
+        cursor = 0
+        
+        for vessel_bucket in vessel_buckets:
+            mmsi = vessel_bucket["key"]
+            candidate = candidates.get(mmsi)
+            if candidate is None:
+                continue
             
             # Process geohash cells to get representative points
             geohash_buckets = vessel_bucket.get("geohash_grid", {}).get("buckets", [])
             if not geohash_buckets:
                 continue
             
-            track_points = []
+            start = end = cursor
+            point_fields = []
             for geohash_bucket in geohash_buckets:
                 rep_hits = geohash_bucket.get("representative_point", {}).get("hits", {}).get("hits", [])
                 if rep_hits:
-                    point_data = rep_hits[0]["_source"]
-                    track_points.append({
-                        "timestamp": point_data["BaseDateTime"],
-                        "lat": point_data["LAT"],
-                        "lon": point_data["LON"],
-                        "sog": 0,  # Not available in this aggregation
-                        "cog": 0,
-                        "heading": 0
-                    })
+                    fields = rep_hits[0]["fields"]
+                    lats[end] = fields["LAT"][0]
+                    lons[end] = fields["LON"][0]
+                    point_fields.append(fields)
+                    end += 1
             
-            # Sort points by timestamp
-            track_points.sort(key=lambda x: x["timestamp"])
+            # Single-point tracks are overwritten by the next vessel
+            if end - start < 2:
+                continue
             
-            # Calculate total distance
-            if len(track_points) > 1:
-                total_distance = self._calculate_track_distance(track_points)
-                
-                if total_distance >= min_distance_miles:
-                    vessels_batch[mmsi] = {
-                        "vessel_name": vessel_metadata.get("VesselName", ""),
-                        "imo": vessel_metadata.get("IMO", ""),
-                        "call_sign": vessel_metadata.get("CallSign", ""),
-                        "vessel_type": str(vessel_metadata.get("VesselType", "")),
-                        "length": vessel_metadata.get("Length"),
-                        "width": vessel_metadata.get("Width"),
-                        "draft": vessel_metadata.get("Draft"),
-                        "track_points": track_points,
-                        "total_distance_miles": total_distance
-                    }
+            tracks.append((mmsi, candidate["server_miles"], start, end))
+            track_fields.append(point_fields)
+            cursor = end
         
-        return vessels_batch
-    
-    def _calculate_track_distance(self, track_points: List[Dict]) -> float:
-        """Calculate total track distance using Haversine formula"""
-        if len(track_points) < 2:
-            return 0.0
-        
-        total_distance = 0.0
-        for i in range(1, len(track_points)):
-            prev_point = track_points[i-1]
-            curr_point = track_points[i]
+        if not tracks:
+            return vessels_batch
+        
+        # Skip tracks whose bounding box cannot hold min_distance_miles of travel,
+        # with every track's box taken in one reduceat sweep over the columns
+        starts = np.fromiter((track[2] for track in tracks), dtype=np.int64, count=len(tracks))
+        point_counts = np.diff(starts, append=cursor)
+        west_lons = np.minimum.reduceat(lons[:cursor], starts)
+        east_lons = np.maximum.reduceat(lons[:cursor], starts)
+        for i in np.flatnonzero(east_lons - west_lons > 180.0):
+            # Possibly crossing the antimeridian; find the narrow wrapped range
+            west_lons[i], east_lons[i] = longitude_bounds(lons[starts[i]:starts[i] + point_counts[i]])
+        upper_bounds = track_distance_upper_bounds_miles(
+            np.minimum.reduceat(lats[:cursor], starts),
+            np.maximum.reduceat(lats[:cursor], starts),
+            west_lons,
+            east_lons,
+            point_counts
+        )
+        
+        kept_tracks = []
+        for track, point_fields, upper_bound in zip(tracks, track_fields, upper_bounds.tolist()):
+            mmsi, server_miles, start, end = track
+            if server_miles is None and upper_bound < min_distance_miles:
+                continue
+            
+            # Timestamps are only read for vessels that survived the prefilter, as epoch
+            # millis so ordering them is an integer sort rather than a string sort
+            timestamps[start:end] = [int(fields["BaseDateTime"][0]) for fields in point_fields]
+            kept_tracks.append(track)
+        tracks = kept_tracks
+        
+        # The query orders cells by time, so tracks normally arrive sorted; count the
+        # backward steps inside every kept track in one pass and sort only tracks that
+        # have any (skipped rejected tracks leave unread gaps, which are never counted)
+        backward_steps = np.concatenate(([0], np.cumsum(timestamps[1:cursor] < timestamps[:cursor - 1])))
+        for mmsi, server_miles, start, end in tracks:
+            if backward_steps[end - 1] == backward_steps[start]:
+                continue
             
-            distance = calculate_distance_miles(
-                prev_point["lat"], prev_point["lon"],
-                curr_point["lat"], curr_point["lon"]
+            # Order all columns by timestamp in place with a single permutation
+            order = np.argsort(timestamps[start:end], kind="stable")
+            timestamps[start:end] = timestamps[start:end][order]
+            lats[start:end] = lats[start:end][order]
+            lons[start:end] = lons[start:end][order]
+        
+        # Tracks without a server-side distance are summed in one batched kernel call
+        pending = [track for track in tracks if track[1] is None]
+        if not pending:
+            pending_miles = ()
+        elif len(pending) == len(upper_bounds):
+            # Every track is pending, so the columns are already packed back to back
+            pending_miles = track_distances_miles_batch(lats[:cursor], lons[:cursor], np.append(starts, cursor))
+        else:
+            offsets = np.zeros(len(pending) + 1, dtype=np.int64)
+            np.cumsum([track[3] - track[2] for track in pending], out=offsets[1:])
+            pending_miles = track_distances_miles_batch(
+                np.concatenate([lats[track[2]:track[3]] for track in pending]),
+                np.concatenate([lons[track[2]:track[3]] for track in pending]),
+                offsets
             )
-            total_distance += distance
+        client_miles = {track[0]: float(miles) for track, miles in zip(pending, pending_miles)}
         
-        return total_distance
+        for mmsi, server_miles, start, end in tracks:
+            # Server-side distances were computed by Elasticsearch over the full-resolution track
+            total_distance = float(server_miles) if server_miles is not None else client_miles[mmsi]
+            if total_distance < min_distance_miles:
+                continue
+            
+            # Metadata stays in candidates; it is only read for the vessels returned
+            vessels_batch[mmsi] = {
+                "timestamps": timestamps[start:end],
+                "lats": lats[start:end],
+                "lons": lons[start:end],
+                "total_distance_miles": total_distance
+            }
+        
+        return vessels_batch
 
 
 # Global singleton instance
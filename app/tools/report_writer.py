@@ -5,8 +5,7 @@ MCP-ready service for generating interactive HTML reports with maps and visualiz
 Designed to be easily converted to MCP server in the future.
 """
 
-import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
 
 import folium
 from folium import plugins
@@ -97,9 +96,12 @@ class ReportWriter:
         if not vessel.track_points:
             return "<p style='color: #FF5A5A; text-align: center; padding: 20px;'>No track data available</p>"
         
+        # Pull the coordinates out of the point dicts once; the track line, the
+        # heatmap and the bounds all read these columns
+        track_coords = [[point["lat"], point["lon"]] for point in vessel.track_points]
+        lats, lons = zip(*track_coords)
+        
         # Calculate map center
-        lats = [point["lat"] for point in vessel.track_points]
-        lons = [point["lon"] for point in vessel.track_points]
         center_lat = sum(lats) / len(lats)
         center_lon = sum(lons) / len(lons)
         
@@ -112,7 +114,6 @@ class ReportWriter:
         )
         
         # Add vessel track line
-        track_coords = [[point["lat"], point["lon"]] for point in vessel.track_points]
         folium.PolyLine(
             locations=track_coords,
             color="#4a90e2",  # Ocean blue
@@ -156,9 +157,8 @@ class ReportWriter:
             ).add_to(m)
         
         # Add heatmap overlay
-        heat_data = [[point["lat"], point["lon"]] for point in vessel.track_points]
         plugins.HeatMap(
-            heat_data,
+            track_coords,
             radius=15,
             blur=12,
             gradient={0.2: '#2c9aa0', 0.4: '#4a90e2', 0.6: '#60a5fa', 1: '#06b6d4'}
@@ -5,16 +5,24 @@ Common utilities used across the application:
 - distance: Geospatial distance calculations
 - file_ops: File and directory operations  
 - data_transform: Data transformation helpers
+- cache: In-memory LRU cache and content digests
 """
 
-from .distance import calculate_distance_miles
+from .distance import calculate_distance_miles, calculate_distances_miles, segment_distances_miles, track_distance_miles, track_distances_miles_batch
 from .file_ops import ensure_directory, sanitize_filename
 from .data_transform import parse_timestamp, format_vessel_name
+from .cache import LRUCache, content_digest
 
 __all__ = [
     'calculate_distance_miles',
+    'calculate_distances_miles',
+    'segment_distances_miles',
+    'track_distance_miles',
+    'track_distances_miles_batch',
     'ensure_directory',
     'sanitize_filename', 
     'parse_timestamp',
-    'format_vessel_name'
+    'format_vessel_name',
+    'LRUCache',
+    'content_digest'
 ]
\ No newline at end of file
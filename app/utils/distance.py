@@ -3,7 +3,20 @@ Geospatial distance calculation utilities using Haversine formula
 """
 
 import math
-from typing import List, Dict, Any
+import threading
+from typing import Callable, List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_MILES = 3959.0
+
+_DEG_TO_RAD = math.pi / 180.0
+
+# Below these sizes per-call overhead outweighs the faster kernel: NumPy's
+# array setup loses to plain math up to a couple dozen points, while the
+# compiled Numba kernel wins from three points on
+_VECTORIZE_MIN_POINTS = 24
+_JIT_MIN_POINTS = 3
 
 
 def calculate_distance_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -22,21 +35,404 @@ def calculate_distance_miles(lat1: float, lon1: float, lat2: float, lon2: float)
     Returns:
         Distance in nautical miles
     """
-    R = 3959  # Earth's radius in miles
+    R = EARTH_RADIUS_MILES
     
-    # Convert degrees to radians
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    # Convert degrees to radians; longitudes only matter as a difference
+    phi1 = lat1 * _DEG_TO_RAD
+    phi2 = lat2 * _DEG_TO_RAD
+    dlat = phi2 - phi1
+    dlon = (lon2 - lon1) * _DEG_TO_RAD
     
     # Haversine formula
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+    a = math.sin(dlat/2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlon/2)**2
     c = 2 * math.asin(math.sqrt(a))
     
     return R * c
 
 
+def calculate_distances_miles(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Calculate great circle distances between many pairs of points in miles.
+    
+    Array counterpart of calculate_distance_miles: arguments are broadcast
+    against each other, so one point can be measured against many. For a
+    single pair the scalar function is faster.
+    
+    Args:
+        lat1: Latitudes of the first points in decimal degrees
+        lon1: Longitudes of the first points in decimal degrees
+        lat2: Latitudes of the second points in decimal degrees
+        lon2: Longitudes of the second points in decimal degrees
+        
+    Returns:
+        Array of distances in miles
+    """
+    phi1 = np.radians(np.asarray(lat1, dtype=np.float64))
+    phi2 = np.radians(np.asarray(lat2, dtype=np.float64))
+    dlon = np.radians(np.asarray(lon2, dtype=np.float64) - np.asarray(lon1, dtype=np.float64))
+    
+    a = np.sin((phi2 - phi1) * 0.5) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlon * 0.5) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+
+def _track_miles_scalar(lats: Sequence[float], lons: Sequence[float]) -> float:
+    """
+    Sum segment distances of a short track in pure Python.
+    
+    Each point is converted to radians and its latitude cosine computed once,
+    then reused by both segments that share it.
+    """
+    radians, sin, cos, asin, sqrt = math.radians, math.sin, math.cos, math.asin, math.sqrt
+    
+    lats_r = [radians(lat) for lat in lats]
+    lons_r = [radians(lon) for lon in lons]
+    cos_lats = [cos(lat) for lat in lats_r]
+    
+    total = 0.0
+    for i in range(1, len(lats_r)):
+        dlat = lats_r[i] - lats_r[i - 1]
+        dlon = lons_r[i] - lons_r[i - 1]
+        a = sin(dlat * 0.5) ** 2 + cos_lats[i - 1] * cos_lats[i] * sin(dlon * 0.5) ** 2
+        total += asin(sqrt(a))
+    return 2 * EARTH_RADIUS_MILES * total
+
+
+def segment_distances_miles(
+    lats: Sequence[float], lons: Sequence[float], dtype: np.dtype = np.float64
+) -> np.ndarray:
+    """
+    Calculate the Haversine distance of every consecutive segment of a track.
+    
+    Coordinate differences are always taken in float64, so short segments
+    keep their precision; dtype only sets the precision of the trigonometry,
+    where float32 runs several times faster on SIMD builds of NumPy at about
+    1e-7 relative error per segment.
+    
+    Args:
+        lats: Latitudes in decimal degrees, in track order
+        lons: Longitudes in decimal degrees, in track order
+        dtype: Floating type for the trigonometry and the returned distances
+        
+    Returns:
+        Array of N - 1 segment distances in miles (empty for fewer than 2 points)
+    """
+    lats_rad = np.radians(np.asarray(lats, dtype=np.float64))
+    lons_rad = np.radians(np.asarray(lons, dtype=np.float64))
+    
+    # One cosine per point, shared by the two segments it belongs to
+    cos_lats = np.cos(lats_rad.astype(dtype, copy=False))
+    
+    # Each term is built in place in one of two segment-sized buffers, so batch-sized
+    # inputs don't allocate a fresh temporary per operation
+    a = np.subtract(lats_rad[1:], lats_rad[:-1]).astype(dtype, copy=False)
+    a *= 0.5
+    np.sin(a, out=a)
+    np.square(a, out=a)
+    
+    lon_term = np.subtract(lons_rad[1:], lons_rad[:-1]).astype(dtype, copy=False)
+    lon_term *= 0.5
+    np.sin(lon_term, out=lon_term)
+    np.square(lon_term, out=lon_term)
+    lon_term *= cos_lats[:-1]
+    lon_term *= cos_lats[1:]
+    a += lon_term
+    
+    np.sqrt(a, out=a)
+    np.arcsin(a, out=a)
+    a *= 2 * EARTH_RADIUS_MILES
+    return a
+
+
+def _track_miles_numpy(lats: np.ndarray, lons: np.ndarray) -> float:
+    """Sum segment distances of a track with a vectorized NumPy Haversine"""
+    return float(segment_distances_miles(lats, lons).sum())
+
+
+def _track_miles_loop(lats, lons):
+    """Sum segment distances of a track in a single loop (compiled by Numba)"""
+    total = 0.0
+    lat1 = math.radians(lats[0])
+    cos_lat1 = math.cos(lat1)
+    for i in range(1, lats.size):
+        # Carry the previous point's radians and cosine into the next segment
+        lat2 = math.radians(lats[i])
+        cos_lat2 = math.cos(lat2)
+        dlon = math.radians(lons[i] - lons[i - 1])
+        a = math.sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * cos_lat2 * math.sin(dlon / 2) ** 2
+        total += math.asin(math.sqrt(a))
+        lat1 = lat2
+        cos_lat1 = cos_lat2
+    return 2 * EARTH_RADIUS_MILES * total
+
+
+# Stand-in for numba.prange; swapped in before the batch kernel is compiled
+_prange = range
+
+
+def _batch_track_miles_loop(lats, lons, offsets):
+    """Sum segment distances of many tracks stored back to back (compiled by Numba)"""
+    track_count = offsets.size - 1
+    totals = np.zeros(track_count)
+    for v in _prange(track_count):
+        start = offsets[v]
+        end = offsets[v + 1]
+        if end - start < 2:
+            continue
+        total = 0.0
+        lat1 = math.radians(lats[start])
+        cos_lat1 = math.cos(lat1)
+        for i in range(start + 1, end):
+            lat2 = math.radians(lats[i])
+            cos_lat2 = math.cos(lat2)
+            dlon = math.radians(lons[i] - lons[i - 1])
+            a = math.sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * cos_lat2 * math.sin(dlon / 2) ** 2
+            total += math.asin(math.sqrt(a))
+            lat1 = lat2
+            cos_lat1 = cos_lat2
+        totals[v] = 2 * EARTH_RADIUS_MILES * total
+    return totals
+
+
+# Numba takes a noticeable share of process start-up to import, so the kernels
+# are compiled on the first track long enough to need them. Explicit signatures
+# (contiguous float64 coordinates, int64 offsets) compile eagerly and skip
+# per-call type dispatch; cache=True reuses the machine code across runs
+_TRACK_MILES_SIGNATURE = "f8(f8[::1], f8[::1])"
+_BATCH_TRACK_MILES_SIGNATURE = "f8[::1](f8[::1], f8[::1], i8[::1])"
+_track_miles_jit: Optional[Callable] = None
+_batch_track_miles_jit: Optional[Callable] = None
+_jit_resolved = False
+_jit_lock = threading.Lock()
+
+# Numba's default workqueue threading layer rejects concurrent parallel launches
+_batch_jit_call_lock = threading.Lock()
+
+
+def _resolve_jit():
+    """Import Numba once and wrap the track kernels, if it is installed"""
+    global _track_miles_jit, _batch_track_miles_jit, _jit_resolved, _prange
+    
+    if _jit_resolved:
+        return
+    with _jit_lock:
+        if _jit_resolved:
+            return
+        try:
+            from numba import njit, prange
+        except ImportError:  # Numba is optional; the NumPy path is used without it
+            njit = None
+        if njit is not None:
+            _prange = prange
+            _track_miles_jit = njit(_TRACK_MILES_SIGNATURE, cache=True, fastmath=True)(_track_miles_loop)
+            _batch_track_miles_jit = njit(
+                _BATCH_TRACK_MILES_SIGNATURE, cache=True, fastmath=True, parallel=True
+            )(_batch_track_miles_loop)
+        _jit_resolved = True
+
+
+def _get_track_miles_jit() -> Optional[Callable]:
+    """Return the Numba-compiled track kernel, or None when Numba is not installed"""
+    _resolve_jit()
+    return _track_miles_jit
+
+
+def _get_batch_track_miles_jit() -> Optional[Callable]:
+    """Return the parallel Numba batch kernel, or None when Numba is not installed"""
+    _resolve_jit()
+    return _batch_track_miles_jit
+
+
+def track_distance_miles(lats: Sequence[float], lons: Sequence[float]) -> float:
+    """
+    Calculate total distance along a track given as parallel coordinate arrays.
+    
+    Uses a Numba-compiled kernel when Numba is installed; otherwise short
+    tracks use a local-bound math loop and longer ones a vectorized NumPy
+    Haversine.
+    
+    Args:
+        lats: Latitudes in decimal degrees, in track order
+        lons: Longitudes in decimal degrees, in track order
+        
+    Returns:
+        Total distance in miles
+    """
+    point_count = len(lats)
+    if point_count < 2:
+        return 0.0
+    
+    if point_count >= _JIT_MIN_POINTS:
+        track_miles_jit = _get_track_miles_jit()
+        if track_miles_jit is not None:
+            lats = np.ascontiguousarray(lats, dtype=np.float64)
+            lons = np.ascontiguousarray(lons, dtype=np.float64)
+            return float(track_miles_jit(lats, lons))
+    
+    if point_count < _VECTORIZE_MIN_POINTS:
+        # Python floats are much faster than NumPy scalars in the math module
+        if isinstance(lats, np.ndarray):
+            lats = lats.tolist()
+        if isinstance(lons, np.ndarray):
+            lons = lons.tolist()
+        return _track_miles_scalar(lats, lons)
+    
+    return _track_miles_numpy(
+        np.asarray(lats, dtype=np.float64),
+        np.asarray(lons, dtype=np.float64)
+    )
+
+
+def track_distances_miles_batch(lats: np.ndarray, lons: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    Calculate total distance of many tracks stored back to back in flat arrays.
+    
+    Track v occupies lats[offsets[v]:offsets[v + 1]] (and the same slice of
+    lons), so offsets has one more entry than there are tracks. With Numba
+    the tracks are summed in parallel in one compiled call; otherwise all
+    segments are computed in one vectorized pass and summed per track.
+    
+    Args:
+        lats: Concatenated latitudes in decimal degrees, each track in order
+        lons: Concatenated longitudes in decimal degrees, each track in order
+        offsets: Start index of every track followed by the total point count
+        
+    Returns:
+        Array with the total distance in miles of every track
+    """
+    lats = np.ascontiguousarray(lats, dtype=np.float64)
+    lons = np.ascontiguousarray(lons, dtype=np.float64)
+    offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+    
+    batch_jit = _get_batch_track_miles_jit()
+    if batch_jit is not None:
+        with _batch_jit_call_lock:
+            return batch_jit(lats, lons, offsets)
+    
+    if lats.size < 2:
+        return np.zeros(offsets.size - 1)
+    
+    # Batches are large enough for float32 trigonometry to pay off; sums stay in float64.
+    # Segments joining the last point of one track to the first of the next don't count;
+    # boundaries of empty tracks at either end of the batch have no such segment
+    segments = segment_distances_miles(lats, lons, dtype=np.float32)
+    boundaries = offsets[1:-1]
+    boundaries = boundaries[(boundaries > 0) & (boundaries < lats.size)]
+    segments[boundaries - 1] = 0.0
+    cumulative = np.concatenate(([0.0], np.cumsum(segments, dtype=np.float64)))
+    
+    # Empty tracks read the same point twice (clamped into range at the end of the batch)
+    starts = np.minimum(offsets[:-1], lats.size - 1)
+    last_points = np.maximum(offsets[1:] - 1, starts)
+    return cumulative[last_points] - cumulative[starts]
+
+
+def longitude_bounds(lons: np.ndarray) -> Tuple[float, float]:
+    """
+    West and east edges of the narrowest longitude range holding every point.
+    
+    A track crossing the antimeridian (e.g. along the Aleutians) has plain
+    min/max longitudes nearly 360 degrees apart; its narrowest range instead
+    runs east from the west edge through 180, so the west edge is returned
+    greater than the east edge.
+    
+    Args:
+        lons: Longitudes in decimal degrees (at least one)
+        
+    Returns:
+        Tuple of (west edge, east edge) in decimal degrees
+    """
+    west, east = float(lons.min()), float(lons.max())
+    
+    # Wrapping can only narrow a range that covers more than half the globe
+    if east - west <= 180.0:
+        return west, east
+    
+    ordered = np.sort(lons)
+    gaps = np.diff(ordered)
+    widest = int(np.argmax(gaps))
+    if gaps[widest] > 360.0 - (east - west):
+        return float(ordered[widest + 1]), float(ordered[widest])
+    return west, east
+
+
+def track_distance_upper_bound_miles(
+    min_lat: float, max_lat: float, min_lon: float, max_lon: float, point_count: int
+) -> float:
+    """
+    Cheap upper bound on the length of any track inside a bounding box.
+    
+    Every segment is no longer than the straight line between its endpoints
+    in (lat, lon) space, whose length is at most the equirectangular distance
+    with longitude scaled at the latitude closest to the equator (where
+    parallels are longest). Applying that to the box's spans bounds every
+    segment; a track of N points has N - 1 of them. Safe for pruning: if the
+    bound is below a threshold, so is the track.
+    
+    A box crossing the antimeridian is given with min_lon > max_lon (its
+    west edge east of its east edge), as longitude_bounds and wrapped
+    geo_bounds report it, and spans eastward from min_lon through 180.
+    
+    Args:
+        min_lat: Minimum latitude of the track in decimal degrees
+        max_lat: Maximum latitude of the track in decimal degrees
+        min_lon: West edge of the track's longitude range in decimal degrees
+        max_lon: East edge of the track's longitude range in decimal degrees
+        point_count: Number of points in the track
+        
+    Returns:
+        Upper bound on total track distance in miles
+    """
+    if point_count < 2:
+        return 0.0
+    
+    if min_lat <= 0.0 <= max_lat:
+        widest_parallel = 1.0
+    else:
+        widest_parallel = math.cos(math.radians(min(abs(min_lat), abs(max_lat))))
+    
+    lon_span = max_lon - min_lon
+    if lon_span < 0.0:
+        lon_span += 360.0
+    
+    # Haversine uses the shorter way around, so no segment spans over 180 degrees of longitude
+    lon_span = min(lon_span, 180.0)
+    segment_bound = EARTH_RADIUS_MILES * math.hypot(
+        math.radians(max_lat - min_lat), widest_parallel * math.radians(lon_span)
+    )
+    
+    # No segment can be longer than half the circumference either
+    segment_bound = min(segment_bound, math.pi * EARTH_RADIUS_MILES)
+    return (point_count - 1) * segment_bound
+
+
+def track_distance_upper_bounds_miles(
+    min_lats: np.ndarray, max_lats: np.ndarray, west_lons: np.ndarray, east_lons: np.ndarray, point_counts: np.ndarray
+) -> np.ndarray:
+    """
+    Array counterpart of track_distance_upper_bound_miles for many tracks at once.
+    
+    Args:
+        min_lats: Minimum latitude of every track in decimal degrees
+        max_lats: Maximum latitude of every track in decimal degrees
+        west_lons: West edge of every track's longitude range in decimal degrees
+        east_lons: East edge of every track's longitude range in decimal degrees
+        point_counts: Number of points in every track
+        
+    Returns:
+        Array with the upper bound on total distance in miles of every track
+    """
+    crosses_equator = (min_lats <= 0.0) & (max_lats >= 0.0)
+    nearest_lat = np.minimum(np.abs(min_lats), np.abs(max_lats))
+    widest_parallel = np.where(crosses_equator, 1.0, np.cos(np.radians(nearest_lat)))
+    
+    lon_spans = np.minimum(np.mod(east_lons - west_lons, 360.0), 180.0)
+    segment_bounds = EARTH_RADIUS_MILES * np.hypot(
+        np.radians(max_lats - min_lats), widest_parallel * np.radians(lon_spans)
+    )
+    segment_bounds = np.minimum(segment_bounds, math.pi * EARTH_RADIUS_MILES)
+    return np.maximum(point_counts - 1, 0) * segment_bounds
+
+
 def calculate_track_distance(track_points: List[Dict[str, Any]]) -> float:
     """
     Calculate total distance traveled along a track of coordinate points.
@@ -47,21 +443,15 @@ def calculate_track_distance(track_points: List[Dict[str, Any]]) -> float:
     Returns:
         Total distance in miles
     """
-    if len(track_points) < 2:
+    point_count = len(track_points)
+    if point_count < 2:
         return 0.0
     
-    total_distance = 0.0
-    for i in range(1, len(track_points)):
-        prev_point = track_points[i-1]
-        curr_point = track_points[i]
-        
-        distance = calculate_distance_miles(
-            prev_point["lat"], prev_point["lon"],
-            curr_point["lat"], curr_point["lon"]
-        )
-        total_distance += distance
-    
-    return total_distance
+    # Plain lists: short tracks take the scalar path, which would convert
+    # arrays straight back to floats, and the kernels convert lists in one copy
+    lats = [point["lat"] for point in track_points]
+    lons = [point["lon"] for point in track_points]
+    return track_distance_miles(lats, lons)
 
 
 def calculate_bounding_box_distance(min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> Dict[str, float]:
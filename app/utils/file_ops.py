@@ -2,12 +2,31 @@
 File and directory operation utilities
 """
 
+import functools
+import hashlib
 import os
 import re
 import shutil
+import tempfile
+import threading
 import urllib.parse
-from typing import Optional
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+# Largest image download accepted, judged from the Content-Length header
+MAX_IMAGE_BYTES = 20 * 1024 * 1024
+
+# Some image hosts and CDNs answer the default python-requests agent with 403
+HTTP_USER_AGENT = "Mozilla/5.0 (compatible; vessel-research-agent/1.0)"
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+# Image downloads are network-bound, so batches share one pool of I/O threads
+_DOWNLOAD_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="vessel-io")
+
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r'[^a-zA-Z0-9\-_\.]')
+_REPEATED_UNDERSCORES_RE = re.compile(r'_{2,}')
 
 
 def ensure_directory(directory_path: str) -> str:
@@ -38,10 +57,10 @@ def sanitize_filename(filename: str, max_length: int = 100) -> str:
     """
     # Remove or replace invalid characters
     # Keep only alphanumeric, hyphens, underscores, and dots
-    safe_filename = re.sub(r'[^a-zA-Z0-9\-_\.]', '_', filename)
+    safe_filename = _UNSAFE_FILENAME_CHARS_RE.sub('_', filename)
     
     # Remove multiple consecutive underscores
-    safe_filename = re.sub(r'_{2,}', '_', safe_filename)
+    safe_filename = _REPEATED_UNDERSCORES_RE.sub('_', safe_filename)
     
     # Remove leading/trailing underscores and dots
     safe_filename = safe_filename.strip('_.')
@@ -57,10 +76,15 @@ def sanitize_filename(filename: str, max_length: int = 100) -> str:
     return safe_filename
 
 
+@functools.lru_cache(maxsize=1024)
 def sanitize_url_for_filename(url: str, max_length: int = 100) -> str:
     """
     Convert URL to safe filename by extracting domain and path.
     
+    URLs that carry a query string or don't fit in max_length get a short
+    digest of the full URL appended, so distinct pages never share a file.
+    Results are memoized, since the same URLs are saved repeatedly.
+    
     Args:
         url: URL to convert
         max_length: Maximum filename length
@@ -79,11 +103,15 @@ def sanitize_url_for_filename(url: str, max_length: int = 100) -> str:
         else:
             filename_base = domain
         
-        return sanitize_filename(filename_base, max_length)
+        safe_filename = sanitize_filename(filename_base, max_length)
+        if parsed.query or len(safe_filename) == max_length:
+            digest = hashlib.blake2b(url.encode('utf-8', errors='replace'), digest_size=4).hexdigest()
+            safe_filename = f"{safe_filename[:max_length - len(digest) - 1]}_{digest}"
+        return safe_filename
         
     except Exception:
-        # Fallback to hash-based filename
-        return f"page_{hash(url) % 10000}"
+        # Fallback to a digest-based filename; unlike hash(), stable across runs
+        return f"page_{hashlib.blake2b(str(url).encode('utf-8', errors='replace'), digest_size=6).hexdigest()}"
 
 
 def safe_move_file(source_path: str, destination_path: str) -> bool:
@@ -143,4 +171,126 @@ def create_vessel_directory(base_dir: str, vessel_mmsi: str) -> str:
         Path to vessel-specific directory
     """
     vessel_dir = os.path.join(base_dir, vessel_mmsi)
-    return ensure_directory(vessel_dir)
\ No newline at end of file
+    return ensure_directory(vessel_dir)
+
+
+def get_http_session():
+    """
+    Return the process-wide requests session used for downloads.
+    
+    Reusing one session keeps connections (and TLS sessions) to image
+    hosts alive across downloads instead of reconnecting per request.
+    Connection errors and gateway errors (502/503/504) are retried with
+    a short backoff, since downloads are plain idempotent GETs. Requests
+    carry HTTP_USER_AGENT instead of the default python-requests agent.
+    
+    Returns:
+        Shared requests.Session
+    """
+    global _http_session
+    
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                
+                session = requests.Session()
+                session.headers["User-Agent"] = HTTP_USER_AGENT
+                retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504), allowed_methods=("GET",))
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=retry)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
+
+def download_image(
+    image_url: str,
+    vessel_name: str,
+    directory: str = "reports/images",
+    timeout: float = 10,
+    max_bytes: int = MAX_IMAGE_BYTES
+) -> str:
+    """
+    Stream an image from a URL straight to disk.
+    
+    The filename carries a digest of the URL, so different images of the
+    same vessel never overwrite each other, and the same URL maps to the
+    same file in every run: an image already on disk is returned without
+    downloading it again. Images are written under a temporary name and
+    renamed when complete, so an interrupted download is never reused.
+    
+    Args:
+        image_url: URL of the image
+        vessel_name: Vessel name used as the filename prefix
+        directory: Directory to save the image in
+        timeout: Request timeout in seconds
+        max_bytes: Largest Content-Length accepted
+        
+    Returns:
+        Path of the saved image
+        
+    Raises:
+        requests.HTTPError: If the server returns an error status
+        ValueError: If the response is not an image or its declared size exceeds max_bytes
+    """
+    safe_name = "".join(c for c in vessel_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    url_digest = hashlib.blake2b(image_url.encode("utf-8"), digest_size=6).hexdigest()
+    filename = os.path.join(directory, f"{safe_name}_{url_digest}.jpg")
+    if os.path.exists(filename):
+        return filename
+    
+    with get_http_session().get(image_url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        
+        # Error and login pages are often served with status 200; never save them as images
+        content_type = response.headers.get("Content-Type", "")
+        if not content_type.lower().startswith("image/"):
+            raise ValueError(f"expected an image, got Content-Type {content_type or 'none'!r}")
+        
+        content_length = int(response.headers.get("Content-Length", "0") or 0)
+        if content_length > max_bytes:
+            raise ValueError(f"image is {content_length} bytes, limit is {max_bytes}")
+        
+        ensure_directory(directory)
+        
+        # Each download gets its own temporary file, so concurrent downloads of the
+        # same URL never share one, and a failed download leaves nothing behind
+        partial = tempfile.NamedTemporaryFile(dir=directory, suffix=".part", delete=False)
+        try:
+            # Let urllib3 undo any Content-Encoding, then copy in 64 KiB blocks without a Python loop
+            response.raw.decode_content = True
+            with partial:
+                shutil.copyfileobj(response.raw, partial, length=65536)
+            os.replace(partial.name, filename)
+        except BaseException:
+            os.unlink(partial.name)
+            raise
+    
+    return filename
+
+
+def download_images(items: List[Dict[str, str]], directory: str = "reports/images") -> List[str]:
+    """
+    Download several images concurrently with download_image.
+    
+    A failed download doesn't stop the batch; its entry carries the error
+    message instead of a path.
+    
+    Args:
+        items: Images to download, each with image_url and vessel_name
+        directory: Directory to save the images in
+        
+    Returns:
+        Path of each saved image, or a "Download failed: ..." message, in input order
+    """
+    def download_one(item: Dict[str, str]) -> str:
+        try:
+            return download_image(item["image_url"], item["vessel_name"], directory=directory)
+        except Exception as e:
+            return f"Download failed: {str(e)}"
+    
+    # map keeps results in input order while the downloads overlap
+    return list(_DOWNLOAD_POOL.map(download_one, items))
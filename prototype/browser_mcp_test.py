@@ -2,6 +2,7 @@
 import asyncio
 import json
 import time
+import urllib.parse
 from typing import Dict, Any, List
 from aiohttp import ClientSession
 from mcp import stdio_client, StdioServerParameters
@@ -65,7 +66,7 @@ class SmartMCPChromeClient:
         results = {"result1": None, "result2": None, "result3": None}
         print(f"🔍 LLM-guided search for: {query}")
 
-        search_url = f"https://www.google.com/search?q={query.replace(' ', '+')}"
+        search_url = f"https://www.google.com/search?q={urllib.parse.quote_plus(query)}"
         search_result = self._call_mcp("chrome_navigate", {"url": search_url})
         time.sleep(3)
 
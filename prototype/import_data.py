@@ -6,7 +6,37 @@ import requests
 
 CHUNK_SIZE = 5000
 
+# One keep-alive connection for the index setup and every bulk chunk
+session = requests.Session()
+
+def index_url_for(es_url):
+    return es_url.rsplit("/", 1)[0] + "/vessel_index"
+
+def ensure_index(es_url):
+    # Map a geo_point next to LAT/LON so searches can aggregate on one field
+    mapping = {"mappings": {"properties": {"location": {"type": "geo_point"}}}}
+    response = session.put(index_url_for(es_url), json=mapping)
+    if response.status_code not in (200, 400):  # 400: index already exists
+        print(f"Error creating index: {response.text}")
+
+def set_bulk_load_settings(es_url, loading):
+    # Skip periodic refreshes and replica copies while loading, then restore the defaults
+    settings = {"index": {"refresh_interval": "-1" if loading else None,
+                          "number_of_replicas": 0 if loading else None}}
+    response = session.put(index_url_for(es_url) + "/_settings", json=settings)
+    if response.status_code != 200:
+        print(f"Error updating index settings: {response.text}")
+
 def import_to_es(csv_file, es_url):
+    ensure_index(es_url)
+    set_bulk_load_settings(es_url, loading=True)
+    try:
+        load_csv(csv_file, es_url)
+    finally:
+        set_bulk_load_settings(es_url, loading=False)
+        session.post(index_url_for(es_url) + "/_refresh")
+
+def load_csv(csv_file, es_url):
     with open(csv_file, 'r') as f:
         reader = csv.DictReader(f)
         headers = reader.fieldnames
@@ -23,6 +53,8 @@ def import_to_es(csv_file, es_url):
                         row[field] = None # or some other default value
                 else:
                     row[field] = None
+            if row["LAT"] is not None and row["LON"] is not None:
+                row["location"] = {"lat": row["LAT"], "lon": row["LON"]}
 
             bulk_data.append(json.dumps(action))
             bulk_data.append(json.dumps(row))
@@ -36,7 +68,7 @@ def import_to_es(csv_file, es_url):
 
 def send_bulk_request(es_url, bulk_data):
     headers = {'Content-Type': 'application/x-ndjson'}
-    response = requests.post(es_url, data='\n'.join(bulk_data) + '\n', headers=headers)
+    response = session.post(es_url, data='\n'.join(bulk_data) + '\n', headers=headers)
     if response.status_code != 200:
         print(f"Error sending bulk request: {response.text}")
     else:
@@ -14,10 +14,13 @@ from langgraph.graph import END, StateGraph
 from langgraph.prebuilt import ToolNode
 
 # --- Elasticsearch Tool ---
+# One client (and keep-alive connection pool) shared by every tool call
+es = Elasticsearch(["http://localhost:9200"], request_timeout=60, max_retries=3, http_compress=True)
+
+
 @tool
 def search_vessel_data(query: str) -> List[dict]:
     """Searches the vessel_index for vessel data."""
-    es = Elasticsearch(["http://localhost:9200"])
     today = datetime.date.today().strftime("%Y-%m-%d")
     # It's a demo, so we just search for today's data
     response = es.search(
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the in-memory caching helpers in app.utils.cache.
+
+These tests run without Elasticsearch or the MCP Chrome bridge.
+"""
+
+from app.utils.cache import LRUCache, content_digest
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest entry
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_miss_returns_default():
+    cache = LRUCache()
+    assert cache.get(("missing", 1), default=[]) == []
+
+
+def test_content_digest_is_stable():
+    assert content_digest("vessel page") == content_digest("vessel page")
+    assert content_digest("vessel page") != content_digest("vessel page 2")
+    assert len(content_digest("")) == 32
+
+
+def test_lru_entries_expire_after_ttl(monkeypatch):
+    from app.utils import cache as cache_module
+    
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    
+    cache = LRUCache(maxsize=4, ttl_seconds=300)
+    cache.set("query", {"hits": 1})
+    now[0] += 299
+    assert cache.get("query") == {"hits": 1}
+    now[0] += 2
+    assert cache.get("query") is None
+    assert len(cache) == 0
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the geospatial distance helpers in app.utils.distance.
+
+These tests run without Elasticsearch or the MCP Chrome bridge.
+"""
+
+import math
+
+from app.utils.distance import (
+    calculate_distance_miles,
+    calculate_distances_miles,
+    calculate_track_distance,
+    longitude_bounds,
+    segment_distances_miles,
+    track_distance_miles,
+    track_distances_miles_batch,
+    track_distance_upper_bound_miles,
+    track_distance_upper_bounds_miles
+)
+
+
+# A short coastal track off Los Angeles, in track order
+TRACK_LATS = [33.70, 33.75, 33.81, 33.90, 34.02, 34.10]
+TRACK_LONS = [-118.20, -118.31, -118.45, -118.52, -118.60, -118.79]
+
+
+def _scalar_track_miles(lats, lons):
+    return sum(
+        calculate_distance_miles(lats[i - 1], lons[i - 1], lats[i], lons[i])
+        for i in range(1, len(lats))
+    )
+
+
+def test_known_distance():
+    """One degree of latitude is ~69 miles"""
+    assert math.isclose(calculate_distance_miles(0.0, 0.0, 1.0, 0.0), 69.09, rel_tol=1e-3)
+
+
+def test_pairwise_distances_match_scalar():
+    """Array distances agree with the scalar formula and broadcast one point"""
+    expected = [
+        calculate_distance_miles(TRACK_LATS[0], TRACK_LONS[0], lat, lon)
+        for lat, lon in zip(TRACK_LATS, TRACK_LONS)
+    ]
+    distances = calculate_distances_miles(TRACK_LATS[0], TRACK_LONS[0], TRACK_LATS, TRACK_LONS)
+    assert distances.shape == (len(TRACK_LATS),)
+    for got, want in zip(distances, expected):
+        assert math.isclose(got, want, rel_tol=1e-12, abs_tol=1e-9)
+
+
+def test_track_distance_matches_scalar_haversine():
+    """Vectorized track distance agrees with summing scalar segments"""
+    expected = _scalar_track_miles(TRACK_LATS, TRACK_LONS)
+    assert math.isclose(track_distance_miles(TRACK_LATS, TRACK_LONS), expected, rel_tol=1e-9)
+
+
+def test_segment_distances():
+    """Per-segment distances match the scalar formula and sum to the track total"""
+    segments = segment_distances_miles(TRACK_LATS, TRACK_LONS)
+    assert segments.shape == (len(TRACK_LATS) - 1,)
+    for i, segment in enumerate(segments, 1):
+        expected = calculate_distance_miles(TRACK_LATS[i - 1], TRACK_LONS[i - 1], TRACK_LATS[i], TRACK_LONS[i])
+        assert math.isclose(segment, expected, rel_tol=1e-9)
+    assert math.isclose(segments.sum(), track_distance_miles(TRACK_LATS, TRACK_LONS), rel_tol=1e-9)
+    assert segment_distances_miles([33.7], [-118.2]).size == 0
+
+
+def test_short_tracks():
+    """Tracks with fewer than two points have no distance"""
+    assert track_distance_miles([], []) == 0.0
+    assert track_distance_miles([33.7], [-118.2]) == 0.0
+    assert math.isclose(
+        track_distance_miles(TRACK_LATS[:3], TRACK_LONS[:3]),
+        _scalar_track_miles(TRACK_LATS[:3], TRACK_LONS[:3]),
+        rel_tol=1e-9
+    )
+
+
+def test_track_points_wrapper():
+    """Dict-based track points go through the same computation"""
+    track_points = [{"lat": lat, "lon": lon} for lat, lon in zip(TRACK_LATS, TRACK_LONS)]
+    assert math.isclose(
+        calculate_track_distance(track_points),
+        track_distance_miles(TRACK_LATS, TRACK_LONS),
+        rel_tol=1e-12
+    )
+
+
+def test_compiled_kernel_matches_numpy():
+    """The Numba kernel (when installed) agrees with the NumPy implementation"""
+    import numpy as np
+    from app.utils import distance
+    
+    lats = np.asarray(TRACK_LATS, dtype=np.float64)
+    lons = np.asarray(TRACK_LONS, dtype=np.float64)
+    expected = distance._track_miles_numpy(lats, lons)
+    
+    track_miles_jit = distance._get_track_miles_jit()
+    if track_miles_jit is not None:
+        assert math.isclose(track_miles_jit(lats, lons), expected, rel_tol=1e-9)
+    assert math.isclose(track_distance_miles(lats, lons), expected, rel_tol=1e-9)
+
+
+def test_upper_bound_never_below_track_distance():
+    """The bounding-box bound is safe for zig-zag tracks in both hemispheres"""
+    import random
+    
+    import numpy as np
+    
+    rnd = random.Random(7)
+    for _ in range(200):
+        base_lat = rnd.uniform(-70, 70)
+        base_lon = rnd.uniform(-179, 170)
+        count = rnd.randint(2, 30)
+        lats = [base_lat + rnd.uniform(-2, 2) for _ in range(count)]
+        lons = [base_lon + rnd.uniform(0, 9) for _ in range(count)]
+        bound = track_distance_upper_bound_miles(min(lats), max(lats), min(lons), max(lons), count)
+        assert bound >= track_distance_miles(lats, lons) - 1e-9
+    
+    # A track crossing the antimeridian is bounded by its narrow wrapped box
+    lats = np.array([52.0, 52.3, 51.9, 52.1])
+    lons = np.array([179.6, -179.8, 179.9, -179.5])
+    west, east = longitude_bounds(lons)
+    assert (west, east) == (179.6, -179.5)
+    bound = track_distance_upper_bound_miles(lats.min(), lats.max(), west, east, lons.size)
+    assert track_distance_miles(lats, lons) <= bound < 500.0
+    
+    assert track_distance_upper_bound_miles(1.0, 1.0, 2.0, 2.0, 50) == 0.0
+    assert track_distance_upper_bound_miles(0.0, 1.0, 0.0, 1.0, 1) == 0.0
+
+
+def test_array_upper_bounds_match_scalar():
+    """The batch bound agrees with the per-track bound, wrapped boxes included"""
+    import numpy as np
+    
+    boxes = np.array([
+        (30.0, 31.0, -120.0, -119.0, 12),
+        (-2.0, 3.0, 10.0, 40.0, 5),
+        (52.0, 52.3, 179.6, -179.5, 4),
+        (10.0, 10.0, 0.0, 0.0, 50),
+        (0.0, 1.0, 0.0, 1.0, 1)
+    ])
+    expected = [
+        track_distance_upper_bound_miles(min_lat, max_lat, west, east, int(count))
+        for min_lat, max_lat, west, east, count in boxes
+    ]
+    bounds = track_distance_upper_bounds_miles(*boxes.T)
+    assert np.allclose(bounds, expected, rtol=1e-12)
+
+
+def test_batch_matches_per_track():
+    """Back-to-back tracks give the same totals as one call per track"""
+    import numpy as np
+    
+    tracks = [
+        (TRACK_LATS, TRACK_LONS),
+        ([10.0, 10.5], [20.0, 20.5]),
+        ([45.0], [-60.0]),
+        (TRACK_LATS[::-1], TRACK_LONS[::-1]),
+    ]
+    lats = np.concatenate([np.asarray(track[0], dtype=np.float64) for track in tracks])
+    lons = np.concatenate([np.asarray(track[1], dtype=np.float64) for track in tracks])
+    offsets = np.concatenate(([0], np.cumsum([len(track[0]) for track in tracks])))
+    
+    totals = track_distances_miles_batch(lats, lons, offsets)
+    assert totals.shape == (len(tracks),)
+    for total, (track_lats, track_lons) in zip(totals, tracks):
+        assert math.isclose(total, track_distance_miles(track_lats, track_lons), rel_tol=1e-9, abs_tol=1e-9)
+
+
+def test_batch_fallback_matches_per_track(monkeypatch):
+    """The NumPy batch path (no Numba) handles empty tracks at either end of the batch"""
+    import numpy as np
+    from app.utils import distance
+    
+    monkeypatch.setattr(distance, "_get_batch_track_miles_jit", lambda: None)
+    
+    tracks = [
+        ([], []),
+        (TRACK_LATS, TRACK_LONS),
+        ([], []),
+        ([10.0, 10.5], [20.0, 20.5]),
+        ([45.0], [-60.0]),
+        ([], []),
+    ]
+    lats = np.concatenate([np.asarray(track[0], dtype=np.float64) for track in tracks])
+    lons = np.concatenate([np.asarray(track[1], dtype=np.float64) for track in tracks])
+    offsets = np.concatenate(([0], np.cumsum([len(track[0]) for track in tracks])))
+    
+    # The fallback runs its trigonometry in float32
+    totals = track_distances_miles_batch(lats, lons, offsets)
+    assert totals.shape == (len(tracks),)
+    for total, (track_lats, track_lons) in zip(totals, tracks):
+        assert math.isclose(total, track_distance_miles(track_lats, track_lons), rel_tol=1e-6, abs_tol=1e-9)
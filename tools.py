@@ -13,6 +13,7 @@ from app.tools.elasticsearch_client import elasticsearch_service
 from app.tools.chrome_mcp_client import chrome_mcp_client
 from app.models.vessel import VesselData
 from app.models.research import WebSearchResult
+from app.utils.file_ops import download_image, download_images
 
 
 @tool
@@ -47,28 +48,16 @@ def web_research_vessel(
 @tool
 def download_vessel_image(image_url: str, vessel_name: str) -> str:
     """Download vessel image from URL."""
-    import requests
-    import os
-    
     try:
-        response = requests.get(image_url, stream=True, timeout=10)
-        if response.status_code == 200:
-            # Create images directory if not exists
-            os.makedirs("reports/images", exist_ok=True)
-            
-            # Generate filename
-            safe_name = "".join(c for c in vessel_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            filename = f"reports/images/{safe_name}_{hash(image_url) % 10000}.jpg"
-            
-            with open(filename, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
-            return filename
+        return download_image(image_url, vessel_name)
     except Exception as e:
         return f"Download failed: {str(e)}"
-    
-    return "Download failed"
+
+
+@tool
+def download_vessel_images(images: List[dict]) -> List[str]:
+    """Download several vessel images at once; each item has image_url and vessel_name."""
+    return download_images(images)
 
 
 # Legacy compatibility - expose the mcp_client
@@ -79,5 +68,6 @@ __all__ = [
     'search_vessels_by_distance',
     'web_research_vessel', 
     'download_vessel_image',
+    'download_vessel_images',
     'mcp_client'
 ]
\ No newline at end of file
@@ -1,15 +1,19 @@
 import argparse
+import json
 import os
+from typing import List
 
 from dotenv import load_dotenv
+from langchain_core.tools import tool
 from langchain_ollama import ChatOllama
 from langgraph.graph import END, StateGraph
 from langgraph.prebuilt import ToolNode
 
 # Import from new modular structure
-from app.models import AnalysisPrompt, AnalysisState, VesselCriteria, WebResearchConfig, ReportConfig, PromptObjective
-from app.tools import ReportWriter, ElasticsearchService, ChromeMCPClient
+from app.models import AnalysisPrompt, AnalysisState, VesselCriteria, VesselData, WebResearchConfig, ReportConfig, PromptObjective
+from app.tools import ReportWriter
 from app.services import VesselSearchService, WebResearchService
+from app.utils.file_ops import download_image, download_images
 
 load_dotenv()
 
@@ -29,7 +33,12 @@ class VesselAnalysisAgent:
         self.web_research_service = WebResearchService(llm=self.llm)
         
         # Create tool functions for LangGraph
-        self.tools = [self._search_vessels_tool(), self._research_vessel_tool(), self._download_image_tool()]
+        self.tools = [
+            self._search_vessels_tool(),
+            self._research_vessel_tool(),
+            self._download_image_tool(),
+            self._download_images_tool()
+        ]
         self.tool_node = ToolNode(self.tools)
         self.llm_with_tools = self.llm.bind_tools(self.tools)
         
@@ -40,8 +49,6 @@ class VesselAnalysisAgent:
     # Tool Functions for LangGraph
     def _search_vessels_tool(self):
         """Tool function for vessel search"""
-        from langchain_core.tools import tool
-        
         @tool
         def search_vessels_by_distance(min_distance_miles: float = 50.0, date: str = "2022-01-01"):
             """Search for vessels with long tracks using optimized Elasticsearch aggregations."""
@@ -54,12 +61,9 @@ class VesselAnalysisAgent:
     
     def _research_vessel_tool(self):
         """Tool function for vessel research"""
-        from langchain_core.tools import tool
-        
         @tool
         def web_research_vessel(vessel_name: str, mmsi: str, imo: str = "", research_focus: str = "specifications"):
             """Research vessel information using multi-step LLM-guided web search."""
-            from app.models.vessel import VesselData
             vessel = VesselData(mmsi=mmsi, vessel_name=vessel_name, imo=imo)
             return self.web_research_service.research_vessel(
                 vessel=vessel,
@@ -70,28 +74,22 @@ class VesselAnalysisAgent:
     
     def _download_image_tool(self):
         """Tool function for image download"""
-        from langchain_core.tools import tool
-        import requests
-        import os
-        
         @tool
         def download_vessel_image(image_url: str, vessel_name: str) -> str:
             """Download vessel image from URL."""
             try:
-                response = requests.get(image_url, stream=True, timeout=10)
-                if response.status_code == 200:
-                    os.makedirs("reports/images", exist_ok=True)
-                    safe_name = "".join(c for c in vessel_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                    filename = f"reports/images/{safe_name}_{hash(image_url) % 10000}.jpg"
-                    
-                    with open(filename, "wb") as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                    return filename
+                return download_image(image_url, vessel_name)
             except Exception as e:
                 return f"Download failed: {str(e)}"
-            return "Download failed"
         return download_vessel_image
+    
+    def _download_images_tool(self):
+        """Tool function for downloading several images concurrently"""
+        @tool
+        def download_vessel_images(images: List[dict]) -> List[str]:
+            """Download several vessel images at once; each item has image_url and vessel_name."""
+            return download_images(images)
+        return download_vessel_images
 
     def _build_workflow(self) -> StateGraph:
         """Build the LangGraph workflow with LLM-driven decision points."""
@@ -175,7 +173,6 @@ class VesselAnalysisAgent:
         ])
         
         try:
-            import json
             # Extract JSON from response
             content = response.content
             if "```json" in content: